@@ -1,42 +1,176 @@
+import heapq
+import os
+import sys
+from collections import deque
+from time import perf_counter_ns
+
 from tabulate import tabulate
 
+from tracing import DISPATCH, INSTRUCTION, OFF, SUMMARY, ConsoleSink, Tracer
+
+# Shared scheduling modules live in the sibling "Scheduling Algorithms" folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                             'Scheduling Algorithms'))
+
+from events import BLOCK, COMPLETE, IDLE, IDLE_PID, QUANTUM, SWITCH, DispatchEvent  # noqa: E402
+from gantt import Timeline  # noqa: E402
+from profiling import TimedTracer  # noqa: E402
+
 
 class Process:
-    def __init__(self, pid, arrival_time, execution_time, resource_info, quantum_size):
+    # Fixed attribute slots keep a PCB small when simulating many processes
+    __slots__ = ('pid', 'arrival_time', 'instruction_count', 'resource_info', 'quantum_size',
+                 'finish_time', 'psw_resume_info_num', 'state', 'pc', 'ir',
+                 'processed_instructions', 'record', 'io_requests', 'io_next', 'blocked_since',
+                 'blocked_time')
+
+    def __init__(self, pid, arrival_time, execution_time, resource_info, quantum_size,
+                 io_requests=()):
         self.pid = pid  # Process ID
         self.arrival_time = arrival_time  # Arrival time of the process
-        # Simulated instruction list
-        self.execution_time = list(range(execution_time))
+        # Number of simulated instructions; the instructions themselves are
+        # generated on demand instead of being stored in a list
+        self.instruction_count = execution_time
         # 0 for no resource needed, 1 for resource needed
         self.resource_info = resource_info
         self.quantum_size = quantum_size  # Time quantum for Round Robin scheduling
         self.finish_time = None  # Time when the process finishes
         # PSW Resume Info (Program Status Word)
         self.psw_resume_info_num = None
-        self.psw_resume_info_address = None  # Memory address for resuming the process
         self.state = 'Ready'  # Initial state is 'Ready'
         self.pc = 0  # Program Counter (current instruction index)
         self.ir = 0  # Instruction Register (holds the current instruction)
         self.processed_instructions = 0  # Number of processed instructions
+        # Optional ProcessTable row view that receives the scheduling results
+        self.record = None
+        # IORequests by program counter for the resource aware scheduler,
+        # the index of the next one to make and the time spent blocked on
+        # them so far; without requests every PCB shares the empty tuple
+        self.io_requests = tuple(sorted(io_requests)) if io_requests else ()
+        self.io_next = 0
+        self.blocked_since = None
+        self.blocked_time = 0
+
+    def next_io_request(self):
+        """Returns the next IORequest still to be made, or None."""
+        if self.io_next < len(self.io_requests):
+            return self.io_requests[self.io_next]
+        return None
+
+    @property
+    def execution_time(self):
+        """Simulated instruction list, as a lazy range."""
+        return range(self.instruction_count)
+
+    def instruction(self, index):
+        """Returns the simulated instruction at index (its own index)."""
+        return index
+
+    @property
+    def psw_resume_info_address(self):
+        """Memory address for resuming the process, built when requested."""
+        if self.psw_resume_info_num is None:
+            return None
+        return f"{self.pid}[{self.psw_resume_info_num}]"
+
+
+def processes_from_table(table, quantum_size, resource_info=0):
+    """Builds PCB processes from a ProcessTable, one per row, linked to their rows."""
+    processes = []
+    for row in table:
+        process = Process(row.pid, row.arrival_time, row.burst_time,
+                          resource_info, quantum_size)
+        process.record = row
+        processes.append(process)
+    return processes
+
+
+def record_dispatch(process, time):
+    """Stores the first dispatch time in the linked ProcessTable row."""
+    if process.record is not None and process.record.start_time == -1:
+        process.record.start_time = time
+        process.record.response_time = time - process.arrival_time
+
+
+def record_finish(process):
+    """Stores completion metrics in the linked ProcessTable row."""
+    if process.record is not None:
+        record = process.record
+        record.completion_time = process.finish_time
+        record.turnaround_time = process.finish_time - process.arrival_time
+        record.waiting_time = record.turnaround_time - process.instruction_count
+        record.remaining_time = 0
+
+
+def pcb_snapshot(process):
+    """Returns the Process Control Block (PCB) fields as a plain dict."""
+    return {
+        'pid': process.pid,
+        'arrival_time': process.arrival_time,
+        'execution_time': process.instruction_count,
+        'resource_info': process.resource_info,
+        'finish_time': process.finish_time,
+        'psw_resume_info_num': process.psw_resume_info_num,
+        'psw_resume_info_address': process.psw_resume_info_address,
+        'quantum_size': process.quantum_size,
+        'state': process.state,
+        'pc': process.pc,
+        'ir': process.ir,
+        'processed_instructions': process.processed_instructions,
+    }
+
+
+def format_pcb(pcb):
+    """Formats a PCB snapshot the way print_pcb shows it."""
+    return "\n".join([
+        f"\nProcess ID = {pcb['pid']}",
+        f"Arrival Time = {pcb['arrival_time']}",
+        f"Execution Time = {pcb['execution_time']}",
+        f"Resource Information = {pcb['resource_info']}",
+        f"Finish Time = {pcb['finish_time'] if pcb['finish_time'] is not None else 'In Progress'}",
+        f"PSW Resume Info Number = {pcb['psw_resume_info_num']}",
+        f"PSW Resume Info Address = {pcb['psw_resume_info_address']}",
+        f"Scheduling Algorithm = Round Robin (Quantum size = {pcb['quantum_size']})",
+        f"State = {pcb['state']}",
+        f"PC = {pcb['pc'] + 1}",
+        f"IR = {pcb['ir'] + 2}",
+        f"No of Processed Instructions = {pcb['processed_instructions']}",
+        "----------------------------------------",
+    ])
 
 
 def print_pcb(process):
     """Prints the Process Control Block (PCB) information."""
-    print(f"\nProcess ID = {process.pid}")
-    print(f"Arrival Time = {process.arrival_time}")
-    print(f"Execution Time = {len(process.execution_time)}")
-    print(f"Resource Information = {process.resource_info}")
-    print(
-        f"Finish Time = {process.finish_time if process.finish_time is not None else 'In Progress'}")
-    print(f"PSW Resume Info Number = {process.psw_resume_info_num}")
-    print(f"PSW Resume Info Address = {process.psw_resume_info_address}")
-    print(
-        f"Scheduling Algorithm = Round Robin (Quantum size = {process.quantum_size})")
-    print(f"State = {process.state}")
-    print(f"PC = {process.pc + 1}")
-    print(f"IR = {process.ir + 2}")
-    print(f"No of Processed Instructions = {process.processed_instructions}")
-    print("----------------------------------------")
+    print(format_pcb(pcb_snapshot(process)))
+
+
+def format_trace_record(record):
+    """Renders a round robin trace record as the classic console text."""
+    event = record['event']
+    if event == 'instruction':
+        return format_pcb(record['pcb'])
+    if event == 'dispatch':
+        return f"\nRunning {record['pid']}"
+    if event == 'switch':
+        return f"\nSwitching to {record['pid']} ({record['cost']} time units)"
+    if event == 'block':
+        if 'resource' in record:
+            return f"\n{record['pid']} is blocked on {record['resource']}."
+        return f"\n{record['pid']} is blocked due to resource issue."
+    if event == 'handle_blocked':
+        return "\nHandling blocked processes..."
+    if event == 'unblock':
+        return f"{record['pid']} is unblocked and ready to resume."
+    if event == 'terminate':
+        return f"{record['pid']} has terminated. Finish Time = {record['time']}."
+    if event == 'done':
+        return "\nAll processes have been terminated or handled."
+    return str(record)
+
+
+def console_tracer(level=INSTRUCTION, output='-'):
+    """Tracer that writes the classic text output in buffered batches."""
+    return Tracer(level, ConsoleSink(format_trace_record, output))
 
 
 def process_summary_table(processes):
@@ -49,7 +183,7 @@ def process_summary_table(processes):
         table.append([
             process.pid,
             process.arrival_time,
-            len(process.execution_time),
+            process.instruction_count,
             process.finish_time if process.finish_time is not None else "In Progress",
             process.psw_resume_info_num,
             process.psw_resume_info_address,
@@ -61,79 +195,415 @@ def process_summary_table(processes):
     print(tabulate(table, headers=headers))
 
 
-def round_robin_scheduler(processes):
-    """Implements the Round Robin scheduling algorithm."""
+def execute_slice(process, run, time, tracer, level):
+    """Executes run instructions of process from time and returns the new time."""
+    if level >= INSTRUCTION:
+        for _ in range(run):
+            # Update IR to current instruction
+            process.ir = process.instruction(process.pc)
+            process.processed_instructions += 1
+            tracer.emit({'event': 'instruction', 'time': time, 'pid': process.pid,
+                         'pcb': pcb_snapshot(process)})
+
+            process.pc += 1  # Increment program counter
+            time += 1  # Increment global time
+    elif run > 0:
+        # Jump over the whole slice at once
+        process.pc += run
+        process.ir = process.instruction(process.pc - 1)
+        process.processed_instructions += run
+        time += run
+    return time
+
+
+def round_robin_events(processes, tracer=None, profiler=None, switch_cost=0, dispatch_cost=0,
+                       use_arrival_times=False):
+    """Runs Round Robin lazily, yielding a DispatchEvent per time slice.
+
+    The ready queue is a deque rotated in O(1) and blocked processes are
+    recognised by their state, so no list is searched or copied per round.
+    Progress is reported through tracer (nothing by default). Below the
+    INSTRUCTION level a quantum is executed in one step.
+
+    Every slice that runs instructions costs dispatch_cost time units
+    first, plus switch_cost when another process ran last; the overhead is
+    yielded as a SWITCH event before the slice.
+
+    By default every process is ready at time 0, as in the classic
+    simulation. With use_arrival_times, a process joins the ready queue
+    once time reaches its arrival_time, ahead of the process whose slice
+    just ended, and the CPU idles while nothing has arrived.
+
+    profiler, if given, counts dispatches, context switches, blocks and
+    unblock sweeps and the switch overhead, and times slice execution
+    ('execute', which includes per-instruction tracing) and tracer output
+    ('output').
+    """
+    if profiler is not None and tracer is not None:
+        tracer = TimedTracer(tracer, profiler)
+    level = tracer.level if tracer is not None else OFF
     time = 0  # Global time counter
+    last_pid = None  # Process that had the CPU last, for context switches
+    ready_queue = deque(processes)  # Processes waiting for the CPU, in turn order
     blocked_queue = []  # Queue for blocked processes
+    pending = deque()  # Processes that have not arrived yet, by arrival time
+    if use_arrival_times:
+        pending.extend(sorted(processes, key=lambda process: process.arrival_time))
+        ready_queue.clear()
 
-    while processes or blocked_queue:
-        active_processes = processes.copy()  # Copy list to iterate without modifying
-
-        for process in active_processes:
-            if process.state == 'Blocked':
-                continue  # Skip blocked processes
-
-            if process.resource_info:  # Check if resource is required
-                # Update PSW Resume Info before blocking
-                process.psw_resume_info_num = process.pc
-                process.psw_resume_info_address = f"{process.pid}[{process.pc}]"
-                process.state = 'Blocked'  # Mark process as blocked
-                blocked_queue.append(process)
-                processes.remove(process)
-                print(f"\n{process.pid} is blocked due to resource issue.")
-                continue  # Move to the next process
-
-            print(f"\nRunning {process.pid}")
-            process.state = 'Running'  # Process is now running
-            quantum_size = process.quantum_size  # Use process-specific quantum size
-
-            # Execute for quantum size or until process finishes
-            for _ in range(quantum_size):
-                if process.pc < len(process.execution_time):
-                    # Update IR to current instruction
-                    process.ir = process.execution_time[process.pc]
-                    process.processed_instructions += 1
-                    print_pcb(process)
-
-                    process.pc += 1  # Increment program counter
-                    time += 1  # Increment global time
-                else:
-                    process.finish_time = time  # Set finish time
-                    process.state = 'Terminated'  # Mark process as terminated
-                    processes.remove(process)
-                    print(
-                        f"{process.pid} has terminated. Finish Time = {process.finish_time}.")
-                    break  # Stop executing this process
-
-            # Update PSW Resume Info for non-terminated processes
-            if process.state != 'Terminated':
-                process.psw_resume_info_num = process.pc
-                process.psw_resume_info_address = f"{process.pid}[{process.pc}]"
-
-            # Mark process as ready for the next round if not terminated or blocked
-            if process.state != 'Terminated' and process not in blocked_queue:
-                process.state = 'Ready'
+    def admit(now):
+        while pending and pending[0].arrival_time <= now:
+            ready_queue.append(pending.popleft())
+
+    while ready_queue or blocked_queue or pending:
+        admit(time)
+        if not ready_queue and not blocked_queue:
+            # Nothing to run until the next arrival
+            if profiler is not None:
+                profiler.count('idle_skips')
+            yield DispatchEvent(IDLE_PID, time, pending[0].arrival_time, IDLE)
+            time = pending[0].arrival_time
+            admit(time)
 
-        # Handle blocked processes
-        if not processes and blocked_queue:
-            print("\nHandling blocked processes...")
-            unblocked_processes = []
+        # Handle blocked processes once nothing else can run
+        if not ready_queue:
+            if level >= DISPATCH:
+                tracer.emit({'event': 'handle_blocked', 'time': time})
             for process in blocked_queue:
                 # Simulate resource availability and unblock process
                 process.resource_info = False
                 process.state = 'Ready'
-                unblocked_processes.append(process)
-                print(f"{process.pid} is unblocked and ready to resume.")
+                if level >= DISPATCH:
+                    tracer.emit({'event': 'unblock', 'time': time, 'pid': process.pid})
+
+            # Move unblocked processes back to the ready queue
+            ready_queue.extend(blocked_queue)
+            blocked_queue.clear()
+            if profiler is not None:
+                profiler.count('unblock_sweeps')
+
+        process = ready_queue.popleft()
+
+        if process.resource_info:  # Check if resource is required
+            # Update PSW Resume Info before blocking
+            process.psw_resume_info_num = process.pc
+            process.state = 'Blocked'  # Mark process as blocked
+            blocked_queue.append(process)
+            if level >= DISPATCH:
+                tracer.emit({'event': 'block', 'time': time, 'pid': process.pid})
+            if profiler is not None:
+                profiler.count('blocks')
+            yield DispatchEvent(process.pid, time, time, BLOCK)
+            continue  # Move to the next process
 
-            # Move unblocked processes back to the active list
-            processes.extend(unblocked_processes)
+        quantum_size = process.quantum_size  # Use process-specific quantum size
+        # Execute for quantum size or until process finishes
+        run = min(quantum_size, process.instruction_count - process.pc)
+
+        # A process with nothing left to run only exits, without a switch
+        overhead = 0
+        if run > 0:
+            overhead = dispatch_cost
+            if last_pid is not None and last_pid != process.pid:
+                overhead += switch_cost
+        if overhead:
+            if level >= DISPATCH:
+                tracer.emit({'event': 'switch', 'time': time, 'pid': process.pid, 'cost': overhead})
+            yield DispatchEvent(process.pid, time, time + overhead, SWITCH)
+            time += overhead
+
+        if level >= DISPATCH:
+            tracer.emit({'event': 'dispatch', 'time': time, 'pid': process.pid})
+        process.state = 'Running'  # Process is now running
+        record_dispatch(process, time)
+        slice_start = time
+
+        if profiler is not None:
+            if run > 0:
+                profiler.count('dispatches')
+                if last_pid is not None and last_pid != process.pid:
+                    profiler.count('context_switches')
+            if overhead:
+                profiler.count('switch_overhead', overhead)
+            execute_started = perf_counter_ns()
+            time = execute_slice(process, run, time, tracer, level)
+            profiler.add_ns('execute', perf_counter_ns() - execute_started)
+        else:
+            time = execute_slice(process, run, time, tracer, level)
+        if run > 0:
+            last_pid = process.pid  # An exit turn does not take over the CPU
+
+        # A process that ran out of instructions inside its quantum terminates
+        # now; one that used the full quantum is noticed on its next turn
+        if run < quantum_size:
+            process.finish_time = time  # Set finish time
+            process.state = 'Terminated'  # Mark process as terminated
+            record_finish(process)
+            if level >= SUMMARY:
+                tracer.emit({'event': 'terminate', 'time': time, 'pid': process.pid})
+            yield DispatchEvent(process.pid, slice_start, time, COMPLETE)
+            continue
+
+        # Update PSW Resume Info and queue the process for its next turn
+        process.psw_resume_info_num = process.pc
+        process.state = 'Ready'
+        admit(time)
+        ready_queue.append(process)
+        yield DispatchEvent(process.pid, slice_start, time, QUANTUM)
+
+    if level >= SUMMARY:
+        tracer.emit({'event': 'done', 'time': time})
+
+
+def round_robin_scheduler(processes, tracer=None, profiler=None, switch_cost=0, dispatch_cost=0,
+                          use_arrival_times=False):
+    """Implements the Round Robin scheduling algorithm.
+
+    Returns the number of dispatches and context switches, the total switch
+    overhead and the CPU utilization in percent, which leaves the overhead
+    out of the busy time. Zero-length exit turns are not dispatches.
+    """
+    stats = {'dispatches': 0, 'context_switches': 0, 'switch_overhead': 0}
+    busy_time = time = 0
+    last_pid = None
+    for pid, start, end, reason in round_robin_events(processes, tracer, profiler, switch_cost,
+                                                      dispatch_cost, use_arrival_times):
+        time = end
+        if reason == SWITCH:
+            stats['switch_overhead'] += end - start
+        elif reason != BLOCK and reason != IDLE and end > start:  # Not an exit turn
+            stats['dispatches'] += 1
+            if last_pid is not None and last_pid != pid:
+                stats['context_switches'] += 1
+            last_pid = pid
+            busy_time += end - start
+    stats['cpu_utilization'] = (busy_time / time) * 100 if time else 0.0
+    return stats
+
+
+def round_robin_io_events(processes, resources, tracer=None):
+    """Runs Round Robin with I/O on shared resources, one DispatchEvent per slice.
+
+    A process leaves the CPU when its program counter reaches its next
+    IORequest, blocks on the named resource of resources (a ResourceManager)
+    until it has been granted and the I/O is done, and then rejoins the
+    ready queue. The CPU idles only while every process is blocked.
+    resource_info is ignored.
+    """
+    level = tracer.level if tracer is not None else OFF
+    time = 0
+    ready_queue = deque(processes)
+
+    def wake(now):
+        # Requeue every process whose I/O finished by now
+        for done_time, process in resources.complete_due(now):
+            process.state = 'Ready'
+            ready_queue.append(process)
+            if level >= DISPATCH:
+                tracer.emit({'event': 'unblock', 'time': done_time, 'pid': process.pid})
+
+    while ready_queue or resources:
+        if not ready_queue:
+            next_time = resources.next_completion()
+            if next_time > time:
+                yield DispatchEvent(IDLE_PID, time, next_time, IDLE)
+                time = next_time
+            wake(time)
+            continue
+
+        process = ready_queue.popleft()
+        if level >= DISPATCH:
+            tracer.emit({'event': 'dispatch', 'time': time, 'pid': process.pid})
+        process.state = 'Running'
+        record_dispatch(process, time)
+        slice_start = time
+
+        # Stop early at the next I/O request
+        run = min(process.quantum_size, process.instruction_count - process.pc)
+        request = process.next_io_request()
+        if request is not None:
+            run = min(run, max(request.at - process.pc, 0))
+        time = execute_slice(process, run, time, tracer, level)
+        wake(time)
+
+        if request is not None and request.at <= process.pc:
+            process.io_next += 1
+            process.psw_resume_info_num = process.pc
+            process.state = 'Blocked'
+            yield DispatchEvent(process.pid, slice_start, time, BLOCK)
+            if level >= DISPATCH:
+                tracer.emit({'event': 'block', 'time': time, 'pid': process.pid,
+                             'resource': request.resource})
+            resources.request(process, request, time)
+            wake(time)  # Zero-length I/O finishes at once
+            continue
+
+        if process.pc == process.instruction_count:
+            process.finish_time = time
+            process.state = 'Terminated'
+            record_finish(process)
+            if level >= SUMMARY:
+                tracer.emit({'event': 'terminate', 'time': time, 'pid': process.pid})
+            yield DispatchEvent(process.pid, slice_start, time, COMPLETE)
+            continue
+
+        process.psw_resume_info_num = process.pc
+        process.state = 'Ready'
+        ready_queue.append(process)
+        yield DispatchEvent(process.pid, slice_start, time, QUANTUM)
+
+    if level >= SUMMARY:
+        tracer.emit({'event': 'done', 'time': time})
+
+
+def round_robin_io_scheduler(processes, resources, tracer=None):
+    """Runs round_robin_io_events to the end and returns the resource stats."""
+    time = 0
+    for event in round_robin_io_events(processes, resources, tracer):
+        time = event.end
+    return resources.stats(time)
+
+
+def multicore_round_robin_scheduler(processes, cpus=2, balancing='global', tracer=None,
+                                    use_arrival_times=False):
+    """Runs Round Robin on several CPUs, one time slice at a time.
+
+    With balancing='global' all CPUs share one ready queue. With 'steal'
+    every CPU has its own queue (processes are dealt out in turn and
+    re-queued on the CPU they ran on) and an idle CPU steals from the back
+    of the longest queue. Blocked processes are released once no CPU has
+    anything ready. Tracing goes up to the DISPATCH level. use_arrival_times
+    admits processes at their arrival_time, as in round_robin_events.
+
+    Returns (cpu_timelines, cpu_utilization, stats): a Timeline per CPU, as
+    from multicore_scheduling, and counts of dispatches, steals and
+    migrations, where a migration is a process resuming on a different CPU.
+    Timelines hold integer pids, so runs are keyed by each process's
+    position in processes (P0, P1, ... in plot_timeline).
+    """
+    level = min(tracer.level, DISPATCH) if tracer is not None else OFF
+    processes = list(processes)
+    position = {id(process): i for i, process in enumerate(processes)}
+    if balancing == 'global':
+        queues = [deque()] * cpus
+    else:
+        queues = [deque() for _ in range(cpus)]
+    if use_arrival_times:
+        pending = deque(sorted(processes, key=lambda process: process.arrival_time))
+    else:
+        pending = deque(processes)
+    admitted = 0  # Processes dealt out so far
+
+    def admit(now):
+        # New processes are dealt out to the queues in turn
+        nonlocal admitted
+        while pending and (not use_arrival_times or pending[0].arrival_time <= now):
+            queues[admitted % cpus].append(pending.popleft())
+            admitted += 1
+
+    blocked_queue = []
+    last_cpu = {}  # id(process) -> CPU it last ran on
+    running = [None] * cpus  # (process, slice_start, run) on each CPU
+    slice_ends = []  # Min-heap of (end_time, cpu)
+    cpu_timelines = [Timeline() for _ in range(cpus)]
+    stats = {'dispatches': 0, 'steals': 0, 'migrations': 0}
+    total_busy_time = 0
+    time = 0
+
+    def terminate(cpu, process, slice_start):
+        process.finish_time = time
+        process.state = 'Terminated'
+        record_finish(process)
+        cpu_timelines[cpu].append(position[id(process)], slice_start, time)
+        if level >= SUMMARY:
+            tracer.emit({'event': 'terminate', 'time': time, 'pid': process.pid, 'cpu': cpu})
+
+    def next_ready(cpu):
+        # Own queue first, then steal, then release the blocked processes
+        queue = queues[cpu]
+        if not queue and balancing == 'steal':
+            victim = max(queues, key=len)
+            if victim:
+                stats['steals'] += 1
+                return victim.pop()
+        if not queue and not any(queues) and blocked_queue:
+            if level >= DISPATCH:
+                tracer.emit({'event': 'handle_blocked', 'time': time})
+            for i, process in enumerate(blocked_queue):
+                process.resource_info = False
+                process.state = 'Ready'
+                queues[i % cpus if balancing == 'steal' else cpu].append(process)
+                if level >= DISPATCH:
+                    tracer.emit({'event': 'unblock', 'time': time, 'pid': process.pid})
             blocked_queue.clear()
+        return queue.popleft() if queue else None
+
+    admit(time)
+    while True:
+        # Give every idle CPU its next time slice
+        for cpu in range(cpus):
+            while running[cpu] is None:
+                process = next_ready(cpu)
+                if process is None:
+                    break
+                if process.resource_info:
+                    process.psw_resume_info_num = process.pc
+                    process.state = 'Blocked'
+                    blocked_queue.append(process)
+                    if level >= DISPATCH:
+                        tracer.emit({'event': 'block', 'time': time, 'pid': process.pid, 'cpu': cpu})
+                    continue
+
+                if level >= DISPATCH:
+                    tracer.emit({'event': 'dispatch', 'time': time, 'pid': process.pid, 'cpu': cpu})
+                process.state = 'Running'
+                record_dispatch(process, time)
+                run = min(process.quantum_size, process.instruction_count - process.pc)
+                if run == 0:
+                    terminate(cpu, process, time)
+                    continue
 
-        # Exit if all processes are handled
-        if not processes and not blocked_queue:
-            print("\nAll processes have been terminated or handled.")
+                # Exit turns are not dispatches, as in round_robin_scheduler
+                stats['dispatches'] += 1
+                if last_cpu.get(id(process), cpu) != cpu:
+                    stats['migrations'] += 1
+                last_cpu[id(process)] = cpu
+                running[cpu] = (process, time, run)
+                heapq.heappush(slice_ends, (time + run, cpu))
+
+        if not slice_ends and not pending:
             break
 
+        # Jump to the next slice end or arrival and settle every slice ending then
+        next_times = [slice_ends[0][0]] if slice_ends else []
+        if pending:
+            next_times.append(pending[0].arrival_time)
+        time = min(next_times)
+        admit(time)
+        while slice_ends and slice_ends[0][0] == time:
+            cpu = heapq.heappop(slice_ends)[1]
+            process, slice_start, run = running[cpu]
+            running[cpu] = None
+            process.pc += run
+            process.ir = process.instruction(process.pc - 1)
+            process.processed_instructions += run
+            total_busy_time += run
+
+            # Same rule as the single CPU scheduler: running out of
+            # instructions inside the quantum terminates the process now
+            if run < process.quantum_size:
+                terminate(cpu, process, slice_start)
+                continue
+            process.psw_resume_info_num = process.pc
+            process.state = 'Ready'
+            queues[cpu].append(process)
+            cpu_timelines[cpu].append(position[id(process)], slice_start, time)
+
+    if level >= SUMMARY:
+        tracer.emit({'event': 'done', 'time': time})
+    cpu_utilization = (total_busy_time / (cpus * time)) * 100 if time else 0.0
+    return cpu_timelines, cpu_utilization, stats
+
 
 def main():
     processes = []  # List of processes
@@ -168,10 +638,11 @@ def main():
     print("ID    Arrival    Execution Time")
     for process in processes:
         print(
-            f"{process.pid}      {process.arrival_time}          {len(process.execution_time)}")
+            f"{process.pid}      {process.arrival_time}          {process.instruction_count}")
 
-    # Call the scheduler
-    round_robin_scheduler(processes)
+    # Call the scheduler, tracing every instruction to the console
+    with console_tracer() as tracer:
+        round_robin_scheduler(processes, tracer)
 
     # process_summary_table(processes)
 
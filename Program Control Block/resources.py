@@ -0,0 +1,101 @@
+import heapq
+from collections import deque, namedtuple
+
+# A process asks for resource once its program counter reaches at, then
+# spends duration time units doing I/O on it before it is ready again
+IORequest = namedtuple('IORequest', ['at', 'resource', 'duration'])
+
+
+class Resource:
+    """A named resource that up to capacity processes can hold at once."""
+
+    __slots__ = ('name', 'capacity', 'in_use', 'waiters', 'grants', 'wait_time', 'busy_time',
+                 'max_waiters')
+
+    def __init__(self, name, capacity=1):
+        if capacity < 1:
+            raise ValueError(f"resource {name!r} needs a capacity of at least 1")
+        self.name = name
+        self.capacity = capacity
+        self.in_use = 0
+        self.waiters = deque()  # (process, request, queued_at) in arrival order
+        self.grants = 0
+        self.wait_time = 0  # Total time processes spent queued for it
+        self.busy_time = 0  # Total I/O time performed on it
+        self.max_waiters = 0
+
+
+class ResourceManager:
+    """Grants resources, queues waiting processes and times their I/O.
+
+    Running I/O is kept on a heap of completion times, so finding and waking
+    the next finished process costs O(log n); a freed resource goes straight
+    to the first process in its wait queue.
+    """
+
+    def __init__(self, capacities):
+        self.resources = {name: Resource(name, capacity) for name, capacity in capacities.items()}
+        self.io_events = []  # Min-heap of (done_time, seq, process, request)
+        self.seq = 0  # Keeps equal completion times in start order
+
+    def __bool__(self):
+        # True while any process is doing I/O (or waiting behind one that is)
+        return bool(self.io_events)
+
+    def request(self, process, request, time):
+        """Blocks process on request.resource; returns True if I/O starts now."""
+        resource = self.resources[request.resource]
+        process.blocked_since = time
+        if resource.in_use < resource.capacity:
+            resource.in_use += 1
+            self._start_io(resource, process, request, time)
+            return True
+        resource.waiters.append((process, request, time))
+        resource.max_waiters = max(resource.max_waiters, len(resource.waiters))
+        return False
+
+    def _start_io(self, resource, process, request, time):
+        resource.grants += 1
+        heapq.heappush(self.io_events, (time + request.duration, self.seq, process, request))
+        self.seq += 1
+
+    def next_completion(self):
+        return self.io_events[0][0] if self.io_events else None
+
+    def complete_due(self, time):
+        """Yields (done_time, process) for every I/O finished by time.
+
+        Each finished process releases its resource, which passes to the
+        next waiter, and has its blocked time added to blocked_time.
+        """
+        while self.io_events and self.io_events[0][0] <= time:
+            done_time, seq, process, request = heapq.heappop(self.io_events)
+            resource = self.resources[request.resource]
+            resource.busy_time += request.duration
+            if resource.waiters:
+                waiter, waiter_request, queued_at = resource.waiters.popleft()
+                resource.wait_time += done_time - queued_at
+                self._start_io(resource, waiter, waiter_request, done_time)
+            else:
+                resource.in_use -= 1
+            process.blocked_time += done_time - process.blocked_since
+            process.blocked_since = None
+            yield done_time, process
+
+    def stats(self, elapsed=None):
+        """Per-resource grants, wait time, busy time and longest queue.
+
+        With elapsed, also the utilization of each resource in percent.
+        """
+        stats = {}
+        for name, resource in self.resources.items():
+            stats[name] = {
+                'capacity': resource.capacity,
+                'grants': resource.grants,
+                'wait_time': resource.wait_time,
+                'busy_time': resource.busy_time,
+                'max_waiters': resource.max_waiters,
+            }
+            if elapsed:
+                stats[name]['utilization'] = resource.busy_time / (resource.capacity * elapsed) * 100
+        return stats
@@ -0,0 +1,76 @@
+import json
+import sys
+
+# Trace levels, from quietest to most detailed
+OFF = 0
+SUMMARY = 1  # Terminations and the end of the run
+DISPATCH = 2  # Plus every dispatch, block and unblock
+INSTRUCTION = 3  # Plus a PCB snapshot for every executed instruction
+
+LEVELS = {'off': OFF, 'summary': SUMMARY, 'dispatch': DISPATCH, 'instruction': INSTRUCTION}
+
+
+class JsonLinesSink:
+    """Buffers trace records and writes them as JSON Lines in batches."""
+
+    def __init__(self, output, batch_size=4096):
+        # output is an open text stream, a file path, or '-' for stdout
+        if output == '-':
+            self.stream, self.owns_stream = sys.stdout, False
+        elif isinstance(output, str):
+            self.stream, self.owns_stream = open(output, 'w'), True
+        else:
+            self.stream, self.owns_stream = output, False
+        self.batch_size = batch_size
+        self.buffer = []
+        self.encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def write(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(''.join(self.encode(record) + '\n' for record in self.buffer))
+            self.buffer.clear()
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.owns_stream:
+            self.stream.close()
+
+
+class ConsoleSink(JsonLinesSink):
+    """Renders trace records as text with formatter and writes them in batches."""
+
+    def __init__(self, formatter, output='-', batch_size=4096):
+        super().__init__(output, batch_size)
+        self.formatter = formatter
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(''.join(self.formatter(record) + '\n' for record in self.buffer))
+            self.buffer.clear()
+        self.stream.flush()
+
+
+class Tracer:
+    """Sends trace records at or below level to a sink."""
+
+    def __init__(self, level=SUMMARY, sink=None):
+        self.level = LEVELS[level] if isinstance(level, str) else level
+        self.sink = sink if sink is not None else JsonLinesSink('-')
+
+    def emit(self, record):
+        self.sink.write(record)
+
+    def close(self):
+        self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,5 +1,8 @@
-import matplotlib.pyplot as plt
-import random
+import numpy as np
+
+from events import COMPLETE, IDLE, IDLE_PID, DispatchEvent
+from gantt import Timeline, plot_timeline
+from process_table import ProcessTable, print_rows, store_results
 
 
 class Process:
@@ -18,7 +21,7 @@ def FIFO_scheduling(processes):
     # Sort processes by arrival time
     processes.sort(key=lambda x: x.arrival_time)
     current_time = 0
-    gantt_chart = []  # Store the execution order for the Gantt chart
+    gantt_chart = Timeline()  # Store the execution order for the Gantt chart
     total_busy_time = 0  # Track CPU busy time for utilization calculation
 
     for process in processes:
@@ -41,58 +44,78 @@ def FIFO_scheduling(processes):
         current_time = process.completion_time
         total_busy_time += process.burst_time  # Increase busy time by burst time
 
-        # Append the process to the Gantt chart for each time unit in its burst time
-        gantt_chart.extend([process.pid] * process.burst_time)
+        # Record the process run in the Gantt chart
+        gantt_chart.append(process.pid, process.start_time, process.completion_time)
 
     # Calculate CPU utilization as percentage
-    cpu_utilization = (total_busy_time / current_time) * 100
+    cpu_utilization = (total_busy_time / current_time) * 100 if current_time else 0.0
+    return gantt_chart, cpu_utilization
+
+
+def FIFO_events(arrivals):
+    # Streams FIFO dispatch events (see events.py); nothing but the current
+    # time is kept in memory.
+    current_time = 0
+    for pid, arrival_time, burst_time in arrivals:
+        if arrival_time > current_time:
+            yield DispatchEvent(IDLE_PID, current_time, arrival_time, IDLE)
+            current_time = arrival_time
+        yield DispatchEvent(pid, current_time, current_time + burst_time, COMPLETE)
+        current_time += burst_time
+
+
+def FIFO_scheduling_vectorized(processes):
+    # Same schedule as FIFO_scheduling computed with whole-array operations.
+    # completion[i] = max(completion[i-1], arrival[i]) + burst[i] unrolls to
+    # prefix_burst[i] + max(0, running max of arrival[j] - prefix_burst[j-1]).
+    # Processes are not reordered; results are written back in place.
+    if isinstance(processes, ProcessTable):
+        arrival, burst = processes.arrival_time, processes.burst_time
+        pids = processes.pid
+    else:
+        arrival = np.array([p.arrival_time for p in processes], dtype=np.int64)
+        burst = np.array([p.burst_time for p in processes], dtype=np.int64)
+        pids = np.array([p.pid for p in processes], dtype=np.int64)
+
+    order = np.argsort(arrival, kind='stable')
+    sorted_arrival = arrival[order]
+    sorted_burst = burst[order]
+    prefix_burst = np.cumsum(sorted_burst)
+    lag = np.maximum.accumulate(sorted_arrival - (prefix_burst - sorted_burst))
+    completion = prefix_burst + np.maximum(lag, 0)
+    start = completion - sorted_burst
+
+    # Back to list positions; store_results derives the other metrics
+    start_time = np.empty_like(start)
+    completion_time = np.empty_like(completion)
+    start_time[order] = start
+    completion_time[order] = completion
+    if isinstance(processes, ProcessTable):
+        store_results(processes, start_time, completion_time)
+    else:
+        store_results(processes, start_time.tolist(), completion_time.tolist())
+
+    gantt_chart = Timeline.from_arrays(pids[order], start, completion)
+    makespan = int(completion[-1]) if len(completion) else 0
+    cpu_utilization = (int(prefix_burst[-1]) / makespan) * 100 if makespan else 0.0
     return gantt_chart, cpu_utilization
 
 
 def print_processes(processes, cpu_utilization):
     print("PID\tArrival\tBurst\tStart\tCompletion\tTurnaround\tWaiting\tResponse")
-    for process in processes:
-        print(f"{process.pid}\t{process.arrival_time}\t{process.burst_time}\t{process.start_time}\t"
-              f"{process.completion_time}\t\t{process.turnaround_time}\t\t{process.waiting_time}\t\t{process.response_time}")
+    print_rows(processes, ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                           'turnaround_time', 'waiting_time', 'response_time'),
+               "{}\t{}\t{}\t{}\t{}\t\t{}\t\t{}\t\t{}")
     print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
 
 
-def plot_gantt_chart(gantt_chart):
-    fig, gnt = plt.subplots()
-
-    # Setting labels for x-axis and y-axis
-    gnt.set_xlabel('Time')
-    gnt.set_ylabel('Process')
-
-    # Setting ticks on y-axis
-    process_ids = list(set(pid for pid in gantt_chart if pid != -1))
-    gnt.set_yticks(process_ids)
-    gnt.set_yticklabels([f'P{pid}' for pid in process_ids])
-
-    # Setting the chart limits
-    gnt.set_xlim(0, len(gantt_chart))
-    gnt.set_ylim(0.5, len(process_ids) + 0.5)
-
-    # Creating a random color for each process
-    colors = {pid: (random.random(), random.random(), random.random())
-              for pid in process_ids}
-
-    # Plotting the Gantt chart
-    for i, pid in enumerate(gantt_chart):
-        if pid != -1:
-            gnt.broken_barh([(i, 1)], (pid - 0.4, 0.8),
-                            facecolors=(colors[pid]))
-
-    # Setting the x-axis ticks to show each minute (each time unit)
-    # Mark every time unit on the x-axis
-    gnt.set_xticks(range(len(gantt_chart)))
-
-    plt.show()
+def plot_gantt_chart(gantt_chart, output=None):
+    plot_timeline(gantt_chart, output=output, title='FIFO')
 
 
 def main(process_list):
     
-    gantt_chart, cpu_utilization = FIFO_scheduling(process_list)
+    gantt_chart, cpu_utilization = FIFO_scheduling_vectorized(process_list)
     print_processes(process_list, cpu_utilization)
     plot_gantt_chart(gantt_chart)
 
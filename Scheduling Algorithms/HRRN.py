@@ -1,5 +1,10 @@
-import matplotlib.pyplot as plt
-import random
+import heapq
+import math
+from time import perf_counter_ns
+
+from events import non_preemptive_events
+from gantt import Timeline, plot_timeline
+from process_table import print_rows, run_events
 
 class Process:
     def __init__(self, pid, arrival_time, burst_time):
@@ -18,21 +23,146 @@ def calculate_response_ratio(process, current_time):
     return (waiting_time + process.burst_time) / process.burst_time
 
 
-def HRRN_scheduling(processes):
+class ResponseRatioQueue:
+    """Ready set for HRRN, bucketed by burst time.
+
+    Within one bucket the earliest arrival always has the highest ratio, so
+    only bucket heads are candidates. Ratio - 1 = (t - arrival) / burst is a
+    line in t and t never decreases, so the heads sit in a kinetic
+    tournament: every tree node keeps the winner of its two children and
+    the time its comparison next fails. A selection only replays the
+    comparisons that failed since the last one plus the paths of changed
+    buckets, O(log^2 b) amortized for b distinct burst times.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # burst_time -> min-heap of (arrival_time, index)
+        self.slots = {}  # burst_time -> leaf slot
+        # Tree nodes are numbered from 1; the leaf of slot s is capacity + s
+        self.capacity = 1
+        self.bursts = [None]  # Slot -> burst_time, None when free
+        self.free = [0]  # Unused slots
+        self.winner = [-1, -1]  # Node -> winning slot, -1 when its subtree is empty
+        self.due = [math.inf, math.inf]  # Node -> earliest failure time in its subtree
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, arrival_time, burst_time, index):
+        bucket = self.buckets.get(burst_time)
+        if bucket is None:
+            bucket = self.buckets[burst_time] = []
+            if not self.free:
+                self._grow()
+            slot = self.free.pop()
+            self.slots[burst_time] = slot
+            self.bursts[slot] = burst_time
+            self.winner[self.capacity + slot] = slot
+        heapq.heappush(bucket, (arrival_time, index))
+        self.size += 1
+        if bucket[0][1] == index:
+            self._invalidate(self.slots[burst_time])
+
+    def pop_highest(self, current_time):
+        # Returns (index, burst_time) of the highest response ratio; equal
+        # ratios go to the lowest index, which is what max() over the
+        # process list does
+        self._replay(1, current_time)
+        slot = self.winner[1]
+        burst_time = self.bursts[slot]
+        bucket = self.buckets[burst_time]
+        arrival_time, index = heapq.heappop(bucket)
+        if not bucket:
+            del self.buckets[burst_time]
+            del self.slots[burst_time]
+            self.bursts[slot] = None
+            self.free.append(slot)
+            self.winner[self.capacity + slot] = -1
+        self._invalidate(slot)
+        self.size -= 1
+        return index, burst_time
+
+    def _grow(self):
+        # Double the leaves; every inner node is recomputed on the next pop
+        old = self.capacity
+        self.capacity *= 2
+        leaves = self.winner[old:] + [-1] * old
+        self.winner = [-1] * self.capacity + leaves
+        self.due = [-math.inf] * self.capacity + [math.inf] * self.capacity
+        self.bursts.extend([None] * old)
+        self.free.extend(range(self.capacity - 1, old - 1, -1))
+
+    def _invalidate(self, slot):
+        node = (self.capacity + slot) // 2
+        while node:
+            self.due[node] = -math.inf
+            node //= 2
+
+    def _replay(self, node, time):
+        # Recompute every comparison below node that has failed by time
+        if self.due[node] > time:
+            return
+        left, right = 2 * node, 2 * node + 1
+        self._replay(left, time)  # Leaves are never due
+        self._replay(right, time)
+        a, b = self.winner[left], self.winner[right]
+        failure = math.inf
+        if a == -1 or b == -1:
+            self.winner[node] = a if b == -1 else b
+        else:
+            winner, loser = (a, b) if self._beats(a, b, time) else (b, a)
+            self.winner[node] = winner
+            failure = self._failure_time(winner, loser, time)
+        self.due[node] = min(failure, self.due[left], self.due[right])
+
+    def _head(self, slot):
+        burst_time = self.bursts[slot]
+        arrival_time, index = self.buckets[burst_time][0]
+        return arrival_time, burst_time, index
+
+    def _beats(self, a, b, time):
+        # Exact comparison of the head ratios of slots a and b at time
+        arrival_a, burst_a, index_a = self._head(a)
+        arrival_b, burst_b, index_b = self._head(b)
+        difference = (time - arrival_a) * burst_b - (time - arrival_b) * burst_a
+        return difference > 0 or (difference == 0 and index_a < index_b)
+
+    def _failure_time(self, winner, loser, time):
+        # When the loser's ratio catches up; only a shorter burst grows faster
+        arrival_w, burst_w, _ = self._head(winner)
+        arrival_l, burst_l, _ = self._head(loser)
+        if burst_l >= burst_w:
+            return math.inf
+        crossing = (arrival_l * burst_w - arrival_w * burst_l) / (burst_w - burst_l)
+        # A tie won on index is rechecked just after time, never at it again
+        return crossing if crossing > time else math.nextafter(time, math.inf)
+
+
+def HRRN_scheduling(processes, profiler=None):
     time = 0
     completed = 0
     n = len(processes)
-    gantt_chart = []
+    gantt_chart = Timeline()
     total_busy_time = 0
+    idle = False  # Whether the CPU was idle in the last time unit
 
     while completed < n:
         # Find the process with the highest response ratio among those that have arrived
+        if profiler is not None:
+            selection_started = perf_counter_ns()
         available_processes = [p for p in processes if p.arrival_time <= time and p.completion_time == 0]
         
         if available_processes:
+            idle = False
             # Select the process with the highest response ratio
             current_process = max(available_processes, key=lambda p: calculate_response_ratio(p, time))
-            gantt_chart.extend([current_process.pid] * current_process.burst_time)
+            if profiler is not None:
+                profiler.add_ns('selection', perf_counter_ns() - selection_started)
+                profiler.count('dispatches')
+                if completed:
+                    profiler.count('context_switches')
+            gantt_chart.append(current_process.pid, time, time + current_process.burst_time)
 
             # Update start time if first execution
             current_process.start_time = time if current_process.start_time == -1 else current_process.start_time
@@ -47,45 +177,44 @@ def HRRN_scheduling(processes):
             completed += 1
             total_busy_time += current_process.burst_time
         else:
-            gantt_chart.append(-1)  # CPU is idle
-            time += 1
-
-    cpu_utilization = (total_busy_time / time) * 100
+            time += 1  # CPU is idle
+            if profiler is not None:
+                profiler.add_ns('selection', perf_counter_ns() - selection_started)
+                if not idle:
+                    profiler.count('idle_skips')  # Once per idle gap, as in HRRN_events
+            idle = True
+
+    cpu_utilization = (total_busy_time / time) * 100 if time else 0.0
     return gantt_chart, cpu_utilization
 
 
-def print_processes(processes, cpu_utilization):
-    print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
-    for process in processes:
-        print(f"{process.pid}\t{process.arrival_time}\t{process.burst_time}\t{process.start_time}\t"
-              f"{process.completion_time}\t{process.response_time}\t\t{process.turnaround_time}\t\t{process.waiting_time}")
-    print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
+def HRRN_events(arrivals, profiler=None):
+    # Streams HRRN dispatch events (see events.py). Equal ratios go to the
+    # lower pid.
+    return non_preemptive_events(arrivals, ResponseRatioQueue(), profiler)
 
 
-def plot_gantt_chart(gantt_chart):
-    fig, gnt = plt.subplots()
-    gnt.set_xlabel('Time')
-    gnt.set_ylabel('Process')
+def HRRN_scheduling_bucketed(processes, profiler=None):
+    # Same policy as HRRN_scheduling without rescanning the process list,
+    # driven by HRRN_events over a pre-sorted arrival list; see run_events.
+    return run_events(processes, lambda arrivals: HRRN_events(arrivals, profiler), profiler)
 
-    process_ids = list(set(pid for pid in gantt_chart if pid != -1))
-    gnt.set_yticks(process_ids)
-    gnt.set_yticklabels([f'P{pid}' for pid in process_ids])
-    gnt.set_xlim(0, len(gantt_chart))
-    gnt.set_ylim(0.5, len(process_ids) + 0.5)
 
-    colors = {pid: (random.random(), random.random(), random.random()) for pid in process_ids}
+def print_processes(processes, cpu_utilization):
+    print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
+    print_rows(processes, ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                           'response_time', 'turnaround_time', 'waiting_time'),
+               "{}\t{}\t{}\t{}\t{}\t{}\t\t{}\t\t{}")
+    print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
 
-    for i, pid in enumerate(gantt_chart):
-        if pid != -1:
-            gnt.broken_barh([(i, 1)], (pid - 0.4, 0.8), facecolors=(colors[pid]))
 
-    gnt.set_xticks(range(len(gantt_chart)))
-    plt.show()
+def plot_gantt_chart(gantt_chart, output=None):
+    plot_timeline(gantt_chart, output=output, title='HRRN')
 
 
 def main(process_list):
 
-    gantt_chart, cpu_utilization = HRRN_scheduling(process_list)
+    gantt_chart, cpu_utilization = HRRN_scheduling_bucketed(process_list)
     print_processes(process_list, cpu_utilization)
     plot_gantt_chart(gantt_chart)
 
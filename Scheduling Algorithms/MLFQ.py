@@ -0,0 +1,196 @@
+import heapq
+import math
+from collections import deque
+from time import perf_counter_ns
+
+from events import COMPLETE, IDLE, IDLE_PID, PREEMPT, QUANTUM, DispatchEvent
+from gantt import plot_timeline
+from process_table import print_rows, run_events
+
+QUANTA = (2, 4, 8)  # Time allotment of each level, highest priority first
+
+
+class Process:
+    def __init__(self, pid, arrival_time, burst_time):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.completion_time = 0
+        self.turnaround_time = 0
+        self.waiting_time = 0
+        self.start_time = -1
+        self.response_time = 0
+
+
+class _Job:
+    __slots__ = ('pid', 'remaining_time', 'level', 'used', 'version')
+
+    def __init__(self, pid, burst_time):
+        self.pid = pid
+        self.remaining_time = burst_time
+        self.level = 0
+        self.used = 0  # Time used of the allotment at the current level
+        self.version = 0  # Invalidates queue and aging entries when the job moves
+
+
+def MLFQ_events(arrivals, quanta=QUANTA, boost_interval=None, aging_threshold=None, profiler=None):
+    # Streams multilevel feedback queue dispatch events (see events.py).
+    # New processes enter the top level; a process that uses up the
+    # allotment of its level drops one level, and the bottom level is plain
+    # Round Robin. A process in a higher level preempts the running one,
+    # which resumes first in its level with what is left of its allotment.
+    # Every boost_interval time units all processes return to the top
+    # level, and with aging_threshold a process that waited that long in
+    # one level moves up a level.
+    #
+    # Each level is a deque; moved processes leave stale entries behind that
+    # are skipped on dispatch. Aging deadlines sit on a heap, so time jumps
+    # straight to the next arrival, slice end, boost or aging deadline.
+    # profiler, if given, counts dispatches, context switches, preemptions,
+    # boosts, promotions and idle skips and times the selection.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)  # Next process that has not arrived yet
+    bottom = len(quanta) - 1
+    levels = [deque() for _ in quanta]  # (job, version) entries per level
+    live = [0] * len(quanta)  # Queued jobs per level, without stale entries
+    aging = []  # Min-heap of (deadline, seq, job, version)
+    seq = 0
+    current = None
+    run_start = 0
+    time = 0
+    next_boost = boost_interval if boost_interval else math.inf
+    last_pid = None  # Process that had the CPU last, for context switches
+
+    def enqueue(job, level, front=False):
+        nonlocal seq
+        job.version += 1
+        job.level = level
+        entry = (job, job.version)
+        if front:
+            levels[level].appendleft(entry)
+        else:
+            levels[level].append(entry)
+        live[level] += 1
+        if aging_threshold is not None and level > 0:
+            heapq.heappush(aging, (time + aging_threshold, seq, job, job.version))
+            seq += 1
+
+    def dequeue(level):
+        queue = levels[level]
+        while True:
+            job, version = queue.popleft()
+            if version == job.version:
+                live[level] -= 1
+                job.version += 1  # Its aging deadline no longer applies
+                return job
+
+    while True:
+        # Admit every process that has arrived by now
+        while pending is not None and pending[1] <= time:
+            pid, arrival_time, burst_time = pending
+            enqueue(_Job(pid, burst_time), 0)
+            pending = next(arrivals, None)
+
+        if time >= next_boost:
+            # Priority boost: every process back to the top level, in level order
+            for level in range(1, len(quanta)):
+                while live[level]:
+                    job = dequeue(level)
+                    job.used = 0
+                    enqueue(job, 0)
+                levels[level].clear()  # Only stale entries are left
+            if current is not None:
+                current.level, current.used = 0, 0
+            next_boost = (time // boost_interval + 1) * boost_interval
+            if profiler is not None:
+                profiler.count('boosts')
+
+        # Aging: promote processes that waited too long in their level
+        while aging and aging[0][0] <= time:
+            deadline, _, job, version = heapq.heappop(aging)
+            if version == job.version:
+                live[job.level] -= 1
+                job.used = 0
+                enqueue(job, job.level - 1)
+                if profiler is not None:
+                    profiler.count('promotions')
+
+        top = next((level for level in range(len(quanta)) if live[level]), None)
+        if current is not None and top is not None and top < current.level:
+            yield DispatchEvent(current.pid, run_start, time, PREEMPT)
+            enqueue(current, current.level, front=True)
+            current = None
+            if profiler is not None:
+                profiler.count('preemptions')
+
+        if current is None:
+            if top is None:
+                if pending is None:
+                    return
+                # CPU is idle until the next arrival
+                if profiler is not None:
+                    profiler.count('idle_skips')
+                yield DispatchEvent(IDLE_PID, time, pending[1], IDLE)
+                time = pending[1]
+                continue
+            if profiler is not None:
+                selection_started = perf_counter_ns()
+            current = dequeue(top)
+            if profiler is not None:
+                profiler.add_ns('selection', perf_counter_ns() - selection_started)
+                profiler.count('dispatches')
+                if last_pid is not None and last_pid != current.pid:
+                    profiler.count('context_switches')
+                last_pid = current.pid
+            run_start = time
+
+        # Run until the slice ends or the next event that may change priorities
+        slice_end = time + min(current.remaining_time, quanta[current.level] - current.used)
+        run_until = slice_end
+        if pending is not None:
+            run_until = min(run_until, pending[1])
+        run_until = min(run_until, next_boost)  # A boost also renews the running allotment
+        if aging:
+            run_until = min(run_until, aging[0][0])
+        current.remaining_time -= run_until - time
+        current.used += run_until - time
+        time = run_until
+
+        if current.remaining_time == 0:
+            yield DispatchEvent(current.pid, run_start, time, COMPLETE)
+            current = None
+        elif current.used == quanta[current.level]:
+            yield DispatchEvent(current.pid, run_start, time, QUANTUM)
+            current.used = 0
+            enqueue(current, min(current.level + 1, bottom))
+            current = None
+
+
+def MLFQ_scheduling(processes, quanta=QUANTA, boost_interval=None, aging_threshold=None,
+                    profiler=None):
+    # Multilevel feedback queue scheduling driven by MLFQ_events. Results are
+    # written to processes in place, like the other event-driven engines; see
+    # run_events.
+    def events(arrivals):
+        return MLFQ_events(arrivals, quanta, boost_interval, aging_threshold, profiler)
+    return run_events(processes, events, profiler, finished=True)
+
+
+def print_processes(processes, cpu_utilization):
+    print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
+    print_rows(processes, ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                           'response_time', 'turnaround_time', 'waiting_time'),
+               "{}\t{}\t{}\t{}\t{}\t{}\t\t{}\t\t{}")
+    print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
+
+
+def plot_gantt_chart(gantt_chart, output=None):
+    plot_timeline(gantt_chart, output=output, title='MLFQ')
+
+
+def main(process_list):
+
+    gantt_chart, cpu_utilization = MLFQ_scheduling(process_list)
+    print_processes(process_list, cpu_utilization)
+    plot_gantt_chart(gantt_chart)
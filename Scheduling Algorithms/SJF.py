@@ -1,5 +1,8 @@
-import matplotlib.pyplot as plt
-import random
+import heapq
+
+from events import non_preemptive_events
+from gantt import Timeline, plot_timeline
+from process_table import print_rows, run_events
 
 
 class Process:
@@ -18,7 +21,7 @@ def SJF_scheduling(processes):
     time = 0
     completed = 0
     n = len(processes)
-    gantt_chart = []
+    gantt_chart = Timeline()
     total_busy_time = 0
     while completed < n:
         # Filter available processes that have arrived and are not completed
@@ -27,7 +30,7 @@ def SJF_scheduling(processes):
         # Select the process with the shortest burst time among the available processes
         if available_processes:
             current_process = min(available_processes, key=lambda x: x.burst_time)
-            gantt_chart.extend([current_process.pid] * current_process.burst_time)
+            gantt_chart.append(current_process.pid, time, time + current_process.burst_time)
 
             # Process execution
             current_process.start_time = time if current_process.start_time == -1 else current_process.start_time
@@ -40,45 +43,56 @@ def SJF_scheduling(processes):
             completed += 1
             total_busy_time += current_process.burst_time
         else:
-            gantt_chart.append(-1)  # CPU is idle
-            time += 1
+            time += 1  # CPU is idle
 
-    cpu_utilization = (total_busy_time / time) * 100
+    cpu_utilization = (total_busy_time / time) * 100 if time else 0.0
     return gantt_chart, cpu_utilization
 
 
-def print_processes(processes, cpu_utilization):
-    print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
-    for process in processes:
-        print(f"{process.pid}\t{process.arrival_time}\t{process.burst_time}\t{process.start_time}\t"
-              f"{process.completion_time}\t{process.response_time}\t\t{process.turnaround_time}\t\t{process.waiting_time}")
-    print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
+class ShortestJobQueue:
+    """Ready set for SJF, a min-heap of (burst_time, pid)."""
+
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, arrival_time, burst_time, pid):
+        heapq.heappush(self.heap, (burst_time, pid))
 
+    def pop_highest(self, current_time):
+        burst_time, pid = heapq.heappop(self.heap)
+        return pid, burst_time
 
-def plot_gantt_chart(gantt_chart):
-    fig, gnt = plt.subplots()
-    gnt.set_xlabel('Time')
-    gnt.set_ylabel('Process')
-    
-    process_ids = list(set(pid for pid in gantt_chart if pid != -1))
-    gnt.set_yticks(process_ids)
-    gnt.set_yticklabels([f'P{pid}' for pid in process_ids])
-    gnt.set_xlim(0, len(gantt_chart))
-    gnt.set_ylim(0.5, len(process_ids) + 0.5)
 
-    colors = {pid: (random.random(), random.random(), random.random()) for pid in process_ids}
+def SJF_events(arrivals, profiler=None):
+    # Streams SJF dispatch events (see events.py). Equal burst times go to
+    # the lower pid.
+    return non_preemptive_events(arrivals, ShortestJobQueue(), profiler)
+
+
+def SJF_scheduling_heap(processes, profiler=None):
+    # Same policy as SJF_scheduling in O(n log n), driven by SJF_events over
+    # a pre-sorted arrival list; see run_events.
+    return run_events(processes, lambda arrivals: SJF_events(arrivals, profiler), profiler)
+
+
+def print_processes(processes, cpu_utilization):
+    print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
+    print_rows(processes, ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                           'response_time', 'turnaround_time', 'waiting_time'),
+               "{}\t{}\t{}\t{}\t{}\t{}\t\t{}\t\t{}")
+    print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
 
-    for i, pid in enumerate(gantt_chart):
-        if pid != -1:
-            gnt.broken_barh([(i, 1)], (pid - 0.4, 0.8), facecolors=(colors[pid]))
 
-    gnt.set_xticks(range(len(gantt_chart)))
-    plt.show()
+def plot_gantt_chart(gantt_chart, output=None):
+    plot_timeline(gantt_chart, output=output, title='SJF')
 
 
 def main(process_list):
 
-    gantt_chart, cpu_utilization = SJF_scheduling(process_list)
+    gantt_chart, cpu_utilization = SJF_scheduling_heap(process_list)
     print_processes(process_list, cpu_utilization)
     plot_gantt_chart(gantt_chart)
 
@@ -1,5 +1,9 @@
-import matplotlib.pyplot as plt
-import random
+import heapq
+from time import perf_counter_ns
+
+from events import COMPLETE, IDLE, IDLE_PID, PREEMPT, SWITCH, DispatchEvent
+from gantt import Timeline, plot_timeline
+from process_table import print_rows, run_events
 
 
 class Process:
@@ -15,7 +19,11 @@ class Process:
         self.response_time = 0
 
 
-def SRT_scheduling(processes):
+def SRT_scheduling(processes, profiler=None, switch_cost=0, dispatch_cost=0):
+    # Every time a different process takes the CPU, dispatch_cost time units
+    # are spent dispatching it, plus switch_cost if another process had the
+    # CPU before. The overhead is not busy time. profiler, if given, counts
+    # dispatches, context switches, preemptions and the overhead.
     n = len(processes)
     time = 0
     completed = 0
@@ -23,10 +31,13 @@ def SRT_scheduling(processes):
     min_remaining_time = float('inf')
     shortest = 0
     is_found = False
-    gantt_chart = []  # To store the process execution order at each time
+    gantt_chart = Timeline()  # To store the process execution order at each time
     total_busy_time = 0  # To calculate CPU utilization
+    idle = False  # Whether the CPU was idle in the last time unit
 
     while completed != n:
+        if profiler is not None:
+            selection_started = perf_counter_ns()
         for i in range(n):
             if processes[i].arrival_time <= time and processes[i].remaining_time > 0:
                 if processes[i].remaining_time < min_remaining_time:
@@ -36,17 +47,39 @@ def SRT_scheduling(processes):
                 elif processes[i].remaining_time == min_remaining_time:
                     if processes[i].arrival_time < processes[shortest].arrival_time:
                         shortest = i
+        if profiler is not None:
+            profiler.add_ns('selection', perf_counter_ns() - selection_started)
 
         if not is_found:
-            time += 1
-            gantt_chart.append(-1)  # No process is being executed
+            time += 1  # No process is being executed
+            if profiler is not None and not idle:
+                profiler.count('idle_skips')  # Once per idle gap, as in SRT_events
+            idle = True
             continue
+        idle = False
 
         if prev != shortest:
+            overhead = dispatch_cost
+            if prev != -1:
+                overhead += switch_cost
+            if profiler is not None:
+                profiler.count('dispatches')
+                if prev != -1:
+                    profiler.count('context_switches')
+                    if processes[prev].remaining_time > 0:
+                        profiler.count('preemptions')
+                if overhead:
+                    profiler.count('switch_overhead', overhead)
+            # The switch runs to the end before the process does
+            time += overhead
             prev = shortest
 
         # Log the process being executed
-        gantt_chart.append(processes[shortest].pid)
+        if profiler is not None:
+            gantt_started = perf_counter_ns()
+        gantt_chart.append(processes[shortest].pid, time, time + 1)
+        if profiler is not None:
+            profiler.add_ns('gantt', perf_counter_ns() - gantt_started)
 
         # Check if it's the first time the process starts
         if processes[shortest].start_time == -1:
@@ -75,53 +108,117 @@ def SRT_scheduling(processes):
         time += 1
 
     cpu_utilization = (total_busy_time / time) * \
-        100  # CPU utilization percentage
+        100 if time else 0.0  # CPU utilization percentage
     return gantt_chart, cpu_utilization
 
 
+def SRT_events(arrivals, profiler=None, switch_cost=0, dispatch_cost=0):
+    # Streams SRT dispatch events (see events.py). Equal (remaining_time,
+    # arrival_time) pairs go to the lower pid. profiler, if given, counts
+    # dispatches, preemptions and idle skips and times the heap selection.
+    #
+    # With switch_cost or dispatch_cost, each dispatch is preceded by a
+    # SWITCH event for its overhead, charged as in SRT_scheduling. Like the
+    # tick loop, a process then runs at least one time unit before the
+    # processes that arrived during the switch may preempt it.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)  # Next process that has not arrived yet
+    ready = []  # Min-heap of (remaining_time, arrival_time, pid)
+    current = None  # [remaining_time, arrival_time, pid] of the running process
+    run_start = 0
+    time = 0
+    dispatched = False  # Whether any process has had the CPU yet
+
+    while True:
+        # Admit every process that has arrived by now
+        while pending is not None and pending[1] <= time:
+            pid, arrival_time, burst_time = pending
+            heapq.heappush(ready, (burst_time, arrival_time, pid))
+            pending = next(arrivals, None)
+
+        if current is None:
+            if not ready:
+                if pending is None:
+                    return
+                # CPU is idle until the next arrival
+                if profiler is not None:
+                    profiler.count('idle_skips')
+                yield DispatchEvent(IDLE_PID, time, pending[1], IDLE)
+                time = pending[1]
+                continue
+            if profiler is not None:
+                selection_started = perf_counter_ns()
+            current = list(heapq.heappop(ready))
+            if profiler is not None:
+                profiler.add_ns('selection', perf_counter_ns() - selection_started)
+                profiler.count('dispatches')
+                if dispatched:
+                    profiler.count('context_switches')
+            overhead = dispatch_cost + (switch_cost if dispatched else 0)
+            dispatched = True
+            run_start = time
+        elif ready and ready[0][:2] < (current[0], current[1]):
+            # A newly arrived process is strictly shorter: preempt. On a full
+            # tie the running process keeps the CPU, as in the tick loop.
+            yield DispatchEvent(current[2], run_start, time, PREEMPT)
+            if profiler is not None:
+                selection_started = perf_counter_ns()
+            heapq.heappush(ready, tuple(current))
+            current = list(heapq.heappop(ready))
+            if profiler is not None:
+                profiler.add_ns('selection', perf_counter_ns() - selection_started)
+                profiler.count('dispatches')
+                profiler.count('context_switches')
+                profiler.count('preemptions')
+            overhead = dispatch_cost + switch_cost
+            run_start = time
+        else:
+            overhead = 0
+
+        switched = overhead > 0
+        if switched:
+            if profiler is not None:
+                profiler.count('switch_overhead', overhead)
+            yield DispatchEvent(current[2], time, time + overhead, SWITCH)
+            time += overhead
+            run_start = time
+
+        # Run until completion or the next arrival, whichever comes first
+        run_until = time + current[0]
+        if pending is not None:
+            run_until = min(run_until, max(pending[1], time + 1) if switched else pending[1])
+        current[0] -= run_until - time
+        time = run_until
+
+        if current[0] == 0:
+            yield DispatchEvent(current[2], run_start, time, COMPLETE)
+            current = None
+
+
+def SRT_scheduling_event_driven(processes, profiler=None, switch_cost=0, dispatch_cost=0):
+    # Same policy as SRT_scheduling, but driven by SRT_events so time jumps
+    # straight to the next arrival or completion instead of advancing one
+    # unit per loop; see run_events. Switch overhead is left out of the
+    # Gantt chart and the busy time.
+    def events(arrivals):
+        return SRT_events(arrivals, profiler, switch_cost, dispatch_cost)
+    return run_events(processes, events, profiler, finished=True)
+
+
 def print_processes(processes, cpu_utilization):
     print("PID\tArrival\tBurst\tStart\tEnd\tResponse\tTurnaround\tWaiting")
-    for process in processes:
-        print(f"{process.pid}\t{process.arrival_time}\t{process.burst_time}\t{process.start_time}\t"
-              f"{process.completion_time}\t{process.response_time}\t\t{process.turnaround_time}\t\t{process.waiting_time}")
+    print_rows(processes, ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                           'response_time', 'turnaround_time', 'waiting_time'),
+               "{}\t{}\t{}\t{}\t{}\t{}\t\t{}\t\t{}")
     print(f"\nCPU Utilization: {cpu_utilization:.2f}%\n")
 
 
-def plot_gantt_chart(gantt_chart):
-    fig, gnt = plt.subplots()
-
-    # Setting labels for x-axis and y-axis
-    gnt.set_xlabel('Time')
-    gnt.set_ylabel('Process')
-
-    # Setting ticks on y-axis
-    process_ids = list(set(pid for pid in gantt_chart if pid != -1))
-    gnt.set_yticks(process_ids)
-    gnt.set_yticklabels([f'P{pid}' for pid in process_ids])
-
-    # Setting the chart limits
-    gnt.set_xlim(0, len(gantt_chart)+0.5)
-    gnt.set_ylim(0.5, len(process_ids) + 0.5)
-
-    # Creating a random color for each process
-    colors = {pid: (random.random(), random.random(), random.random())
-              for pid in process_ids}
-
-    # Plotting the Gantt chart
-    for i, pid in enumerate(gantt_chart):
-        if pid != -1:
-            gnt.broken_barh([(i, 1)], (pid - 0.4, 0.8),
-                            facecolors=(colors[pid]))
-
-    # Setting the x-axis ticks to show each minute (each time unit)
-    # Mark every time unit on the x-axis
-    gnt.set_xticks(range(len(gantt_chart)+1))
-
-    plt.show()
+def plot_gantt_chart(gantt_chart, output=None):
+    plot_timeline(gantt_chart, output=output, title='SRT')
 
 
 def main(process_list):
 
-    gantt_chart, cpu_utilization = SRT_scheduling(process_list)
+    gantt_chart, cpu_utilization = SRT_scheduling_event_driven(process_list)
     print_processes(process_list, cpu_utilization)
     plot_gantt_chart(gantt_chart)
@@ -0,0 +1,170 @@
+"""Non-interactive batch runner.
+
+Reads a workload of pid, arrival and burst columns from a CSV or JSON Lines
+file (or stdin) or a binary .trace file, runs the selected algorithms headless and writes the
+per-process metrics, or only the per-algorithm summary, as CSV or JSON.
+
+    python batch.py workload.csv --algorithms SJF HRRN --format json -o metrics.jsonl
+    cat workload.jsonl | python batch.py - --input-format jsonl --summary
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from array import array
+
+from cache import ResultCache
+from gantt import plot_timeline
+from main import compare_algorithms
+from process_table import ProcessTable
+from schedulers import ALGORITHMS, run_algorithm, summarize
+from tracefile import open_trace
+
+# Accepted spellings of each input column
+FIELD_NAMES = {
+    'pid': ('pid', 'id'),
+    'arrival': ('arrival', 'arrival_time'),
+    'burst': ('burst', 'burst_time'),
+}
+
+METRIC_COLUMNS = ('pid', 'arrival_time', 'burst_time', 'start_time', 'completion_time',
+                  'turnaround_time', 'waiting_time', 'response_time')
+
+
+def _field(record, name, line_number):
+    for key in FIELD_NAMES[name]:
+        if key in record:
+            return int(record[key])
+    raise ValueError(f"line {line_number}: missing '{name}' column")
+
+
+def read_workload(stream, input_format):
+    """Parses a workload stream into a ProcessTable one record at a time.
+
+    Rows go straight into compact array('q') columns, so no per-process
+    Python object is kept around while reading.
+    """
+    pids, arrivals, bursts = array('q'), array('q'), array('q')
+    if input_format == 'csv':
+        records = csv.DictReader(stream)
+        start = 2  # Line 1 is the header
+    elif input_format == 'jsonl':
+        records = (json.loads(line) for line in stream if line.strip())
+        start = 1
+    else:
+        raise ValueError(f"unknown input format: {input_format}")
+
+    for line_number, record in enumerate(records, start=start):
+        pids.append(_field(record, 'pid', line_number))
+        arrivals.append(_field(record, 'arrival', line_number))
+        bursts.append(_field(record, 'burst', line_number))
+    return ProcessTable(pids, arrivals, bursts)
+
+
+def write_metrics(stream, results, output_format):
+    """Writes one row per (algorithm, process) as CSV or JSON Lines."""
+    if output_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(('algorithm',) + METRIC_COLUMNS)
+    for name, (table, gantt_chart, cpu_utilization) in results.items():
+        columns = [getattr(table, column).tolist() for column in METRIC_COLUMNS]
+        for row in zip(*columns):
+            if output_format == 'csv':
+                writer.writerow((name,) + row)
+            else:
+                record = {'algorithm': name, **dict(zip(METRIC_COLUMNS, row))}
+                stream.write(json.dumps(record) + "\n")
+
+
+def write_summary(stream, results, output_format):
+    """Writes one aggregate row per algorithm as CSV or a JSON object."""
+    summaries = {name: summarize(table, cpu_utilization)
+                 for name, (table, gantt_chart, cpu_utilization) in results.items()}
+    if output_format == 'csv':
+        writer = csv.writer(stream)
+        fields = list(next(iter(summaries.values())))
+        writer.writerow(['algorithm'] + fields)
+        for name, summary in summaries.items():
+            writer.writerow([name] + [summary[field] for field in fields])
+    else:
+        json.dump(summaries, stream, indent=2)
+        stream.write("\n")
+
+
+def workload_format(path, input_format=None):
+    # input_format if given, else guessed from the file extension; csv for stdin
+    if input_format is not None:
+        return input_format
+    if path == '-':
+        return 'csv'
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.trace':
+        return 'trace'
+    return 'jsonl' if extension in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def load_workload(path, input_format=None):
+    """Reads the workload at path, or stdin for '-', as a ProcessTable.
+
+    input_format is 'csv', 'jsonl' or 'trace' (by default from the file
+    extension, csv for stdin). A trace is mapped rather than read.
+    """
+    input_format = workload_format(path, input_format)
+    if input_format == 'trace':
+        return open_trace(path)
+    if path == '-':
+        return read_workload(sys.stdin, input_format)
+    with open(path, newline='') as stream:
+        return read_workload(stream, input_format)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run CPU scheduling algorithms on a workload file.")
+    parser.add_argument('input', help="workload file with pid, arrival and burst columns, or - for stdin")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl', 'trace'),
+                        help="workload format (default: from the file extension, csv for stdin)")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS),
+                        type=str.upper, help="algorithms to run (default: all)")
+    parser.add_argument('-f', '--format', choices=('csv', 'json'), default='csv',
+                        help="output format; json writes JSON Lines for per-process metrics")
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('--summary', action='store_true',
+                        help="write only the per-algorithm summary instead of per-process metrics")
+    parser.add_argument('--plot-dir', help="save one Gantt chart per algorithm as ALGORITHM.png here")
+    parser.add_argument('--cache-dir',
+                        help="reuse results cached here (default: $SCHEDULER_CACHE_DIR, if set)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="number of worker processes (default: 1, run in this process)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    table = load_workload(args.input, args.input_format)
+
+    if args.plot_dir is not None:
+        os.makedirs(args.plot_dir, exist_ok=True)
+
+    cache = ResultCache(args.cache_dir) if args.cache_dir is not None else None
+    if args.workers > 1:
+        results = compare_algorithms(table, args.algorithms, max_workers=args.workers,
+                                     plot_dir=args.plot_dir, cache=cache)
+    else:
+        results = {}
+        for name in args.algorithms:
+            results[name] = run_algorithm(name, table, cache)
+            if args.plot_dir is not None:
+                plot_timeline(results[name][1], output=os.path.join(args.plot_dir, f"{name}.png"),
+                              title=name)
+
+    write = write_summary if args.summary else write_metrics
+    if args.output == '-':
+        write(sys.stdout, results, args.format)
+    else:
+        with open(args.output, 'w', newline='') as stream:
+            write(stream, results, args.format)
+
+
+if __name__ == "__main__":
+    main()
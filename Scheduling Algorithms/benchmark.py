@@ -0,0 +1,191 @@
+"""Benchmarks the scheduling engines on synthetic workloads.
+
+Times every engine on workloads of growing size, reports wall time, peak
+traced memory and the scaling exponent, and can save or compare against a
+JSON baseline to catch regressions.
+
+    python benchmark.py --sizes 100 1000 10000 --save-baseline baseline.json
+    python benchmark.py --engines SRT_event_driven HRRN_bucketed --compare baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import FIFO
+import HRRN
+import MLFQ
+import SJF
+import SRT
+from workloads import ARRIVALS, BURSTS, generate
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                             'Program Control Block'))
+
+import PCB  # noqa: E402
+
+RR_QUANTUM = 4
+
+
+def _objects(module):
+    # Fresh Process objects of module for each run, since the engines
+    # write their results into (and FIFO reorders) the process list
+    def setup(table):
+        return [module.Process(pid, arrival_time, burst_time) for pid, arrival_time, burst_time
+                in zip(table.pid.tolist(), table.arrival_time.tolist(), table.burst_time.tolist())]
+    return setup
+
+
+def _table(table):
+    return table.copy()
+
+
+def _pcb_processes(table):
+    return PCB.processes_from_table(table.copy(), RR_QUANTUM)
+
+
+# name -> (engine, setup building its input from a ProcessTable, largest
+# size it is run at by default; the reference engines are quadratic or
+# step one time unit at a time)
+ENGINES = {
+    'FIFO': (FIFO.FIFO_scheduling, _objects(FIFO), 10**6),
+    'FIFO_vectorized': (FIFO.FIFO_scheduling_vectorized, _table, 10**7),
+    'SJF': (SJF.SJF_scheduling, _objects(SJF), 10**4),
+    'SJF_heap': (SJF.SJF_scheduling_heap, _table, 10**7),
+    'SRT': (SRT.SRT_scheduling, _objects(SRT), 10**3),
+    'SRT_event_driven': (SRT.SRT_scheduling_event_driven, _table, 10**7),
+    'HRRN': (HRRN.HRRN_scheduling, _objects(HRRN), 10**4),
+    'HRRN_bucketed': (HRRN.HRRN_scheduling_bucketed, _table, 10**7),
+    'MLFQ': (MLFQ.MLFQ_scheduling, _table, 10**7),
+    'RR': (PCB.round_robin_scheduler, _pcb_processes, 10**6),
+}
+
+
+def measure(engine, setup, table, repeat=3, trace_memory=True):
+    """Best wall time of repeat runs, and the peak traced memory of one more."""
+    best = math.inf
+    for _ in range(repeat):
+        arguments = setup(table)
+        start = time.perf_counter()
+        engine(arguments)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        arguments = setup(table)
+        tracemalloc.start()
+        engine(arguments)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(results):
+    # Slope of log(time) against log(size): 1 is linear, 2 quadratic
+    points = [(math.log(size), math.log(seconds))
+              for size, (seconds, peak) in results.items() if seconds > 0]
+    if len(points) < 2:
+        return None
+    x, y = zip(*points)
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def run_benchmarks(engines, sizes, arrivals='poisson', bursts='exponential', load=0.9,
+                   seed=0, repeat=3, trace_memory=True, no_limit=False):
+    """Returns {engine: {size: (seconds, peak_bytes)}} for every size in range."""
+    tables = {size: generate(size, arrivals, bursts, load, seed) for size in sizes}
+    results = {}
+    for name in engines:
+        engine, setup, max_size = ENGINES[name]
+        results[name] = {}
+        for size in sizes:
+            if size > max_size and not no_limit:
+                continue
+            results[name][size] = measure(engine, setup, tables[size], repeat, trace_memory)
+    return results
+
+
+def print_results(results):
+    print("Engine\t\t\tSize\t\tSeconds\t\tPeak MiB")
+    for name, by_size in results.items():
+        for size, (seconds, peak) in by_size.items():
+            peak_mib = f"{peak / 2**20:.2f}" if peak is not None else "-"
+            print(f"{name:<24}{size:<16}{seconds:<16.6f}{peak_mib}")
+    print("\nEngine\t\t\tScaling exponent")
+    for name, by_size in results.items():
+        exponent = scaling_exponent(by_size)
+        print(f"{name:<24}{exponent:.2f}" if exponent is not None else f"{name:<24}-")
+
+
+def save_baseline(path, results, settings):
+    baseline = {
+        'settings': settings,
+        'results': {name: {str(size): {'seconds': seconds, 'peak_bytes': peak}
+                           for size, (seconds, peak) in by_size.items()}
+                    for name, by_size in results.items()},
+    }
+    with open(path, 'w') as stream:
+        json.dump(baseline, stream, indent=2)
+        stream.write("\n")
+
+
+def compare_baseline(path, results, tolerance=0.25):
+    """Lists (engine, size, baseline, current) for runs slower than tolerance allows."""
+    with open(path) as stream:
+        baseline = json.load(stream)['results']
+    regressions = []
+    for name, by_size in results.items():
+        for size, (seconds, peak) in by_size.items():
+            previous = baseline.get(name, {}).get(str(size))
+            if previous is not None and seconds > previous['seconds'] * (1 + tolerance):
+                regressions.append((name, size, previous['seconds'], seconds))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the CPU scheduling engines.")
+    parser.add_argument('-e', '--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES),
+                        help="engines to time (default: all)")
+    parser.add_argument('-n', '--sizes', nargs='+', type=int,
+                        default=[10**k for k in range(2, 8)],
+                        help="workload sizes (default: 100 up to 10000000)")
+    parser.add_argument('--arrivals', choices=list(ARRIVALS), default='poisson')
+    parser.add_argument('--bursts', choices=list(BURSTS), default='exponential')
+    parser.add_argument('--load', type=float, default=0.9, help="offered load (default: 0.9)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="timed runs per size, best is kept")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--no-limit', action='store_true',
+                        help="run every engine at every size, even the slow reference engines")
+    parser.add_argument('--save-baseline', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 0.25)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.engines, args.sizes, args.arrivals, args.bursts, args.load,
+                             args.seed, args.repeat, not args.no_memory, args.no_limit)
+    print_results(results)
+
+    if args.save_baseline is not None:
+        settings = {name: getattr(args, name) for name in ('arrivals', 'bursts', 'load', 'seed', 'repeat')}
+        save_baseline(args.save_baseline, results, settings)
+
+    if args.compare is not None:
+        regressions = compare_baseline(args.compare, results, args.tolerance)
+        for name, size, previous, seconds in regressions:
+            print(f"REGRESSION {name} at {size}: {previous:.6f}s -> {seconds:.6f}s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+
+from gantt import Timeline
+from process_table import RESULT_COLUMNS
+
+# Setting this variable turns on the cache in run_algorithm and its callers
+CACHE_DIR_VARIABLE = 'SCHEDULER_CACHE_DIR'
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of scheduling results.
+
+    An entry is keyed by a hash of the pid, arrival and burst columns, the
+    algorithm name and its parameters (every keyword that changes the
+    result, such as an RR quantum), and holds the result columns, the CPU
+    utilization and, if there is one, the Timeline and profiler counters in
+    one .npz file. Once the directory grows past max_bytes the least
+    recently used entries are removed.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, table, algorithm, **params):
+        digest = hashlib.sha256()
+        for column in (table.pid, table.arrival_time, table.burst_time):
+            digest.update(np.ascontiguousarray(column, dtype=np.int64).tobytes())
+        digest.update(json.dumps([algorithm, params], sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key, table, profiler=None):
+        """Fills the result columns of table from the cache.
+
+        Returns (gantt_chart, cpu_utilization), or None on a miss;
+        gantt_chart is None if the entry was stored without one. Stored
+        profiler counters are added to profiler.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as entry:
+                results = {name: entry[name] for name in RESULT_COLUMNS}
+                gantt_chart = None
+                if 'gantt_pids' in entry.files:
+                    gantt_chart = Timeline.from_arrays(entry['gantt_pids'], entry['gantt_starts'],
+                                                       entry['gantt_ends'])
+                cpu_utilization = float(entry['cpu_utilization'])
+                counters = json.loads(str(entry['counters'])) if 'counters' in entry.files else {}
+        except (OSError, KeyError, ValueError):
+            return None  # Missing, evicted meanwhile, or a partial file
+        for name, column in results.items():
+            setattr(table, name, column)
+        if profiler is not None:
+            profiler.counters.update(counters)
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass  # Evicted since it was read; what was read is still valid
+        return gantt_chart, cpu_utilization
+
+    def put(self, key, table, gantt_chart, cpu_utilization, profiler=None):
+        arrays = {name: getattr(table, name) for name in RESULT_COLUMNS}
+        if gantt_chart is not None:
+            arrays['gantt_pids'] = np.frombuffer(gantt_chart.pids, dtype=np.int64)
+            arrays['gantt_starts'] = np.frombuffer(gantt_chart.starts, dtype=np.int64)
+            arrays['gantt_ends'] = np.frombuffer(gantt_chart.ends, dtype=np.int64)
+        if profiler is not None:
+            arrays['counters'] = np.array(json.dumps(dict(profiler.counters)))
+        buffer = io.BytesIO()
+        np.savez(buffer, cpu_utilization=np.float64(cpu_utilization), **arrays)
+        # Write then rename, so concurrent readers never see half an entry
+        temporary = self._path(f"{key}.{os.getpid()}.tmp")
+        with open(temporary, 'wb') as stream:
+            stream.write(buffer.getbuffer())
+        os.replace(temporary, self._path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz') and entry.name.count('.') == 1:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Another process evicted it first
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                os.remove(entry.path)
+
+
+def default_cache():
+    # The cache named by SCHEDULER_CACHE_DIR, or None when it is not set
+    directory = os.environ.get(CACHE_DIR_VARIABLE)
+    return ResultCache(directory) if directory else None
@@ -0,0 +1,65 @@
+from collections import namedtuple
+from time import perf_counter_ns
+
+
+# One contiguous stretch of CPU time; pid is IDLE_PID while the CPU is idle
+DispatchEvent = namedtuple('DispatchEvent', ['pid', 'start', 'end', 'reason'])
+
+IDLE_PID = -1
+
+# Why a stretch ended
+COMPLETE = 'complete'  # The process finished
+PREEMPT = 'preempt'  # A better process took the CPU
+QUANTUM = 'quantum'  # The time slice ran out
+BLOCK = 'block'  # The process blocked on a resource
+IDLE = 'idle'  # Nothing was ready to run
+SWITCH = 'switch'  # Context switch and dispatch overhead before pid runs
+
+# The event engines (FIFO_events, SJF_events, SRT_events, HRRN_events and
+# MLFQ_events) stream DispatchEvents one run at a time. arrivals is an
+# iterable of (pid, arrival_time, burst_time) in arrival order and may be
+# unbounded; only the processes that have arrived and not finished are
+# held in memory. Time jumps straight to the next event, and a stretch
+# with nothing ready is yielded as one IDLE event. run_events in
+# process_table runs an engine over a process list or table.
+
+
+def non_preemptive_events(arrivals, ready, profiler=None):
+    # Event engine for a policy that runs every job to completion. ready
+    # picks the job: push(arrival_time, burst_time, pid) adds an arrived
+    # job, and pop_highest(time) removes the one to run at time and returns
+    # (pid, burst_time). profiler, if given, counts dispatches, context
+    # switches and idle skips and times the selection.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)  # Next process that has not arrived yet
+    time = 0
+    dispatched = False  # Whether any process has had the CPU yet
+
+    while True:
+        if not ready:
+            if pending is None:
+                return
+            if pending[1] > time:
+                # Skip the idle gap up to the next arrival in one step
+                if profiler is not None:
+                    profiler.count('idle_skips')
+                yield DispatchEvent(IDLE_PID, time, pending[1], IDLE)
+                time = pending[1]
+
+        # Admit every process that has arrived by now
+        while pending is not None and pending[1] <= time:
+            pid, arrival_time, burst_time = pending
+            ready.push(arrival_time, burst_time, pid)
+            pending = next(arrivals, None)
+
+        if profiler is not None:
+            selection_started = perf_counter_ns()
+        pid, burst_time = ready.pop_highest(time)
+        if profiler is not None:
+            profiler.add_ns('selection', perf_counter_ns() - selection_started)
+            profiler.count('dispatches')
+            if dispatched:
+                profiler.count('context_switches')
+        dispatched = True
+        yield DispatchEvent(pid, time, time + burst_time, COMPLETE)
+        time += burst_time
@@ -0,0 +1,144 @@
+from array import array
+
+import numpy as np
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+MAX_LABELLED_ROWS = 50  # Processes that get one labelled row each
+
+
+class Timeline:
+    """Run-length encoded Gantt chart: one (pid, start, end) run per segment.
+
+    Idle time is not stored; it is the gap between consecutive runs.
+    """
+
+    def __init__(self):
+        self.pids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __iter__(self):
+        return zip(self.pids, self.starts, self.ends)
+
+    @property
+    def end_time(self):
+        return self.ends[-1] if self.ends else 0
+
+    def append(self, pid, start, end):
+        if end <= start:
+            return
+        # Extend the last run instead of opening a new one when possible
+        if self.pids and self.pids[-1] == pid and self.ends[-1] == start:
+            self.ends[-1] = end
+            return
+        self.pids.append(pid)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    @classmethod
+    def from_arrays(cls, pids, starts, ends):
+        # Vectorized counterpart of calling append() for each run in order
+        pids = np.asarray(pids, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        keep = ends > starts
+        pids, starts, ends = pids[keep], starts[keep], ends[keep]
+        timeline = cls()
+        if not len(pids):
+            return timeline
+
+        # A run continues the previous one when the pid repeats with no gap
+        continues = np.zeros(len(pids), dtype=bool)
+        continues[1:] = (pids[1:] == pids[:-1]) & (starts[1:] == ends[:-1])
+        heads = np.flatnonzero(~continues)
+        tails = np.append(heads[1:] - 1, len(pids) - 1)
+
+        timeline.pids.frombytes(pids[heads].tobytes())
+        timeline.starts.frombytes(starts[heads].tobytes())
+        timeline.ends.frombytes(ends[tails].tobytes())
+        return timeline
+
+    def to_list(self, idle=-1):
+        # Expand to the old one-entry-per-time-unit chart
+        gantt_chart = []
+        time = 0
+        for pid, start, end in self:
+            gantt_chart.extend([idle] * (start - time))
+            gantt_chart.extend([pid] * (end - start))
+            time = end
+        return gantt_chart
+
+    @classmethod
+    def from_list(cls, gantt_chart, idle=-1):
+        timeline = cls()
+        for time, pid in enumerate(gantt_chart):
+            if pid != idle:
+                timeline.append(pid, time, time + 1)
+        return timeline
+
+
+def plot_timeline(gantt_chart, output=None, title=None, show=True):
+    """Draws a Gantt chart with all runs in a single PolyCollection.
+
+    gantt_chart may be a Timeline or an old per-time-unit list. With output
+    set, the chart is rendered headless to that file (PNG, SVG, ...) instead
+    of opening a window. With show=False the window is created but not shown,
+    so several charts can be displayed together with one plt.show().
+    Every process gets its own row; above MAX_LABELLED_ROWS only a readable
+    subset of the rows is labelled.
+    """
+    if not isinstance(gantt_chart, Timeline):
+        gantt_chart = Timeline.from_list(gantt_chart)
+
+    pids = np.frombuffer(gantt_chart.pids, dtype=np.int64)
+    starts = np.frombuffer(gantt_chart.starts, dtype=np.int64)
+    ends = np.frombuffer(gantt_chart.ends, dtype=np.int64)
+    process_ids = np.unique(pids)
+    rows = np.searchsorted(process_ids, pids) + 1
+
+    if output is None:
+        fig, gnt = plt.subplots()
+    else:
+        # A bare Figure renders through Agg and never touches a GUI backend
+        fig = Figure()
+        gnt = fig.add_subplot()
+
+    gnt.set_xlabel('Time')
+    gnt.set_ylabel('Process')
+    if title:
+        gnt.set_title(title)
+
+    if len(process_ids) <= MAX_LABELLED_ROWS:
+        gnt.set_yticks(range(1, len(process_ids) + 1))
+        gnt.set_yticklabels([f'P{pid}' for pid in process_ids.tolist()])
+    else:
+        # One tick per row costs minutes on large charts; label a few rows
+        gnt.yaxis.set_major_locator(MaxNLocator(integer=True))
+        gnt.yaxis.set_major_formatter(FuncFormatter(
+            lambda row, _: f'P{process_ids[int(row) - 1]}' if 1 <= row <= len(process_ids) else ''))
+    gnt.set_xlim(0, max(gantt_chart.end_time, 1))
+    gnt.set_ylim(0.5, max(len(process_ids), 1) + 0.5)
+    # Let matplotlib pick a readable number of integer ticks
+    gnt.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+    # One rectangle (four corners) per run, all drawn as one collection
+    bottom, top = rows - 0.4, rows + 0.4
+    verts = np.stack([np.column_stack(corner) for corner in
+                      ((starts, bottom), (starts, top), (ends, top), (ends, bottom))], axis=1)
+    colors = plt.get_cmap('tab20')
+    # Edges in the face color keep runs narrower than a pixel visible
+    gnt.add_collection(PolyCollection(verts, facecolors=colors(rows % 20), edgecolors='face',
+                                      linewidths=0.5))
+
+    if output is None:
+        if show:
+            plt.show()
+    else:
+        fig.savefig(output)
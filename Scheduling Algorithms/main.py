@@ -1,51 +1,65 @@
-import subprocess; 
-
-# while True:
-#         print("\nScheduling Algorithms\n Choose an algorithm.")
-#         print("1. FIFO")
-#         print("2. SRT (Shortest Remaining Time)")
-#         print("3. SJF (Shortest Job First)")
-#         print("4. HRRN (Highest Response Ratio Next)")
-#         print("5. Exit")
-        
-#         choice = input("Enter your choice: ")
-        
-#         if choice == '1':
-#             subprocess.run(["python", "FIFO.py"])
-#         elif choice == '2':
-#             subprocess.run(["python", "SRT.py"])
-#         elif choice == '3':
-#             subprocess.run(["python", "SJF.py"])
-#         elif choice == '4':
-#             subprocess.run(["python", "HRRN.py"])
-#         elif choice == '5':
-#             print("Exiting program.")
-#             break
-#         else:
-#             print("Invalid choice. Please select a valid option.")
-import FIFO
-import SRT
-import SJF
-import HRRN
-class Process:
-    def __init__(self, pid, arrival_time, burst_time):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.completion_time = 0
-        self.turnaround_time = 0
-        self.waiting_time = 0
-        self.start_time = 0
-        self.response_time = 0
-
-process_list = []
-num_processes = int(input("Enter the number of processes: "))
-for i in range(num_processes):
-    arrival_time = int(input(f"Enter arrival time for process {i+1}: "))
-    burst_time = int(input(f"Enter burst time for process {i+1}: "))
-    process_list.append(Process(i+1, arrival_time, burst_time))
-
-FIFO.main(process_list)
-SRT.main(process_list)
-SJF.main(process_list)
-HRRN.main(process_list)
\ No newline at end of file
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+
+from gantt import plot_timeline
+from process_table import ProcessTable
+from schedulers import ALGORITHMS, MODULES, run_algorithm, summarize
+
+
+def _run_in_worker(name, table, plot_dir, cache):
+    # The table arrives pickled, so every worker schedules its own copy
+    table, gantt_chart, cpu_utilization = run_algorithm(name, table, cache)
+    if plot_dir is not None:
+        plot_timeline(gantt_chart, output=os.path.join(plot_dir, f"{name}.png"), title=name)
+    return table, gantt_chart, cpu_utilization
+
+
+def compare_algorithms(table, algorithms=None, max_workers=None, plot_dir=None, cache=None):
+    """Runs several schedulers concurrently on the same workload.
+
+    Returns {name: (table, gantt_chart, cpu_utilization)} in the order of
+    algorithms. With plot_dir set, each worker also saves NAME.png there.
+    cache is passed on to run_algorithm.
+    """
+    algorithms = list(algorithms or ALGORITHMS)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {name: pool.submit(_run_in_worker, name, table, plot_dir, cache)
+                   for name in algorithms}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def print_comparison(results):
+    print("Algorithm\tAvg Waiting\tAvg Turnaround\tAvg Response\tP95 Response\tP99 Response\t"
+          "Max Waiting\tMakespan\tCPU Utilization")
+    for name, (table, gantt_chart, cpu_utilization) in results.items():
+        summary = summarize(table, cpu_utilization)
+        print(f"{name}\t\t{summary['avg_waiting']:.2f}\t\t{summary['avg_turnaround']:.2f}\t\t"
+              f"{summary['avg_response']:.2f}\t\t{summary['p95_response']}\t\t{summary['p99_response']}\t\t"
+              f"{summary['max_waiting']}\t\t{summary['makespan']}\t\t{summary['cpu_utilization']:.2f}%")
+
+
+def main():
+    pids, arrival_times, burst_times = [], [], []
+    num_processes = int(input("Enter the number of processes: "))
+    for i in range(num_processes):
+        pids.append(i + 1)
+        arrival_times.append(int(input(f"Enter arrival time for process {i+1}: ")))
+        burst_times.append(int(input(f"Enter burst time for process {i+1}: ")))
+    table = ProcessTable(pids, arrival_times, burst_times)
+
+    results = compare_algorithms(table)
+    for name, (scheduled, gantt_chart, cpu_utilization) in results.items():
+        print(f"\n{name}")
+        MODULES[name].print_processes(scheduled, cpu_utilization)
+    print_comparison(results)
+
+    # Open every chart at once instead of blocking on each in turn
+    for name, (scheduled, gantt_chart, cpu_utilization) in results.items():
+        plot_timeline(gantt_chart, title=name, show=False)
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
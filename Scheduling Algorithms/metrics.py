@@ -0,0 +1,217 @@
+import operator
+from array import array
+
+import numpy as np
+
+from events import COMPLETE, IDLE_PID, SWITCH
+from process_table import ProcessTable
+
+SUB_BUCKET_BITS = 7  # 2**6 buckets per power of two: values within 1/64 (~1.6%)
+PERCENTILES = (50, 95, 99)
+_POWERS_OF_TWO = np.left_shift(1, np.arange(63, dtype=np.int64))
+
+
+def _bucket_keys(values):
+    # Bucket of each value: exact below 2**SUB_BUCKET_BITS, then the top
+    # SUB_BUCKET_BITS bits together with the shift that was dropped
+    # bit lengths in integers: frexp of a float64 rounds values above 2**53
+    values = np.asarray(values, dtype=np.int64)
+    bit_lengths = np.searchsorted(_POWERS_OF_TWO, values, side='right')
+    shifts = np.maximum(bit_lengths - SUB_BUCKET_BITS, 0).astype(np.int64)
+    return (shifts << SUB_BUCKET_BITS) | (values >> shifts)
+
+
+class LogHistogram:
+    """HDR-style histogram of non-negative integers with bounded memory.
+
+    Values share a bucket only when they agree in their top SUB_BUCKET_BITS
+    bits, so any percentile is within about 1.6% of the exact value while
+    a whole int64 range fits in a few thousand buckets.
+    """
+
+    def __init__(self):
+        self.counts = {}  # bucket key -> count
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        value = operator.index(value)  # Also numpy integers, which lack bit_length
+        shift = max(value.bit_length() - SUB_BUCKET_BITS, 0)
+        key = (shift << SUB_BUCKET_BITS) | (value >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def record_many(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+        keys, counts = np.unique(_bucket_keys(values), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += len(values)
+        # Sum the high and low halves apart so the int64 sum cannot wrap
+        self.total += (int((values >> 32).sum()) << 32) + int((values & 0xFFFFFFFF).sum())
+        low, high = int(values.min()), int(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Highest value equivalent to the q-th percentile (0 < q <= 100)."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * q // 100))  # ceil without floats
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= rank:
+                shift = key >> SUB_BUCKET_BITS
+                upper = (((key & ((1 << SUB_BUCKET_BITS) - 1)) + 1) << shift) - 1
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+
+class MetricsAggregator:
+    """Single-pass scheduling statistics: means, percentiles, throughput and
+    utilization per window of window time units.
+
+    Feed it finished processes with record() or record_table(), or a
+    DispatchEvent stream with observe() and consume(). Memory stays bounded
+    by the histograms, the processes in flight and one counter per window.
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.waiting = LogHistogram()
+        self.turnaround = LogHistogram()
+        self.response = LogHistogram()
+        self.window_busy = array('q')  # Busy time in each window
+        self.first_arrival = None
+        self.last_completion = 0
+        self.in_flight = {}  # pid -> [arrival_time, burst_time, start_time]
+
+    def record(self, arrival_time, burst_time, start_time, completion_time):
+        turnaround_time = completion_time - arrival_time
+        self.turnaround.record(turnaround_time)
+        self.waiting.record(turnaround_time - burst_time)
+        self.response.record(start_time - arrival_time)
+        if self.first_arrival is None or arrival_time < self.first_arrival:
+            self.first_arrival = arrival_time
+        self.last_completion = max(self.last_completion, completion_time)
+
+    def record_table(self, table, gantt_chart=None):
+        """Adds a scheduled ProcessTable, and its Timeline for utilization."""
+        if not isinstance(table, ProcessTable):
+            table = _scheduled_table(table)
+        if not len(table):
+            return
+        self.turnaround.record_many(table.turnaround_time)
+        self.waiting.record_many(table.waiting_time)
+        self.response.record_many(table.response_time)
+        first_arrival = int(table.arrival_time.min())
+        if self.first_arrival is None or first_arrival < self.first_arrival:
+            self.first_arrival = first_arrival
+        self.last_completion = max(self.last_completion, int(table.completion_time.max()))
+        if gantt_chart is not None:
+            self._add_timeline(gantt_chart)
+
+    def observe(self, arrivals):
+        """Passes (pid, arrival, burst) through, remembering them until completion."""
+        for pid, arrival_time, burst_time in arrivals:
+            self.in_flight[pid] = [arrival_time, burst_time, None]
+            yield pid, arrival_time, burst_time
+
+    def consume(self, events):
+        """Folds DispatchEvents of arrivals passed through observe() into the stats."""
+        for pid, start, end, reason in events:
+            if pid == IDLE_PID or reason == SWITCH:
+                continue
+            self.add_busy(start, end)
+            job = self.in_flight[pid]
+            if job[2] is None:
+                job[2] = start
+            if reason == COMPLETE:
+                del self.in_flight[pid]
+                self.record(job[0], job[1], job[2], end)
+
+    def add_busy(self, start, end):
+        # Split the busy interval [start, end) over the windows it covers
+        window = self.window
+        while start < end:
+            index = start // window
+            if index >= len(self.window_busy):
+                self.window_busy.extend([0] * (index + 1 - len(self.window_busy)))
+            boundary = min(end, (index + 1) * window)
+            self.window_busy[index] += boundary - start
+            start = boundary
+
+    def _add_timeline(self, timeline):
+        # Busy time up to every window edge, from the cumulative run lengths
+        starts = np.frombuffer(timeline.starts, dtype=np.int64)
+        ends = np.frombuffer(timeline.ends, dtype=np.int64)
+        if not len(ends):
+            return
+        lengths = ends - starts
+        cumulative = np.concatenate(([0], np.cumsum(lengths)))
+        edges = np.arange(0, int(ends[-1]) + self.window, self.window, dtype=np.int64)
+        finished = np.searchsorted(ends, edges, side='right')
+        partial = np.zeros(len(edges), dtype=np.int64)
+        inside = finished < len(ends)
+        runs = finished[inside]
+        partial[inside] = np.clip(edges[inside] - starts[runs], 0, lengths[runs])
+        busy = np.diff(cumulative[finished] + partial)
+
+        if len(busy) > len(self.window_busy):
+            self.window_busy.extend([0] * (len(busy) - len(self.window_busy)))
+        merged = np.frombuffer(self.window_busy, dtype=np.int64)[:len(busy)] + busy
+        self.window_busy[:len(busy)] = array('q', merged.tobytes())
+
+    def utilization(self):
+        """CPU utilization in percent for each window."""
+        return [busy / self.window * 100 for busy in self.window_busy]
+
+    def report(self):
+        completed = self.turnaround.count
+        span = self.last_completion - (self.first_arrival or 0)
+        report = {
+            'processes': completed,
+            'throughput': completed / span if span else 0.0,
+        }
+        if self.window_busy:
+            # Over [0, last completion], like the cpu_utilization of the engines
+            makespan = self.last_completion
+            report['cpu_utilization'] = sum(self.window_busy) / makespan * 100 if makespan else 0.0
+        for name, histogram in (('waiting', self.waiting), ('turnaround', self.turnaround),
+                                ('response', self.response)):
+            report[f'avg_{name}'] = histogram.mean
+            for q in PERCENTILES:
+                report[f'p{q}_{name}'] = histogram.percentile(q)
+            report[f'max_{name}'] = histogram.max or 0
+        return report
+
+
+def _scheduled_table(processes):
+    # ProcessTable holding the results of a scheduled list of Process objects
+    table = ProcessTable.from_processes(processes)
+    for name in ('start_time', 'completion_time', 'turnaround_time', 'waiting_time', 'response_time'):
+        setattr(table, name, np.array([getattr(p, name) for p in processes], dtype=np.int64))
+    return table
@@ -0,0 +1,206 @@
+import heapq
+
+from gantt import Timeline
+from HRRN import ResponseRatioQueue
+from process_table import arrival_order, read_columns, store_results
+
+POLICIES = ('FIFO', 'SJF', 'SRT', 'HRRN')
+BALANCING = ('global', 'steal')
+
+
+class _Job:
+    __slots__ = ('index', 'arrival_time', 'burst_time', 'remaining_time', 'started', 'last_cpu')
+
+    def __init__(self, index, arrival_time, burst_time):
+        self.index = index
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.started = False
+        self.last_cpu = None  # CPU the job last ran on
+
+
+class _RunQueue:
+    """Ready processes of one run queue, ordered by the scheduling policy."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.heap = ResponseRatioQueue() if policy == 'HRRN' else []
+        self.jobs = {}  # index -> job, for the HRRN queue
+        self.work = 0  # Total remaining time of the queued jobs
+
+    def __len__(self):
+        return len(self.heap)
+
+    def key(self, job):
+        # Ties go to the lower list index, like the single-CPU engines
+        if self.policy == 'FIFO':
+            return (job.arrival_time, job.index)
+        if self.policy == 'SJF':
+            return (job.burst_time, job.index)
+        return (job.remaining_time, job.arrival_time, job.index)
+
+    def push(self, job):
+        self.work += job.remaining_time
+        if self.policy == 'HRRN':
+            self.jobs[job.index] = job
+            self.heap.push(job.arrival_time, job.burst_time, job.index)
+        else:
+            heapq.heappush(self.heap, (self.key(job), job))
+
+    def pop(self, time):
+        if self.policy == 'HRRN':
+            index, burst_time = self.heap.pop_highest(time)
+            job = self.jobs.pop(index)
+        else:
+            job = heapq.heappop(self.heap)[1]
+        self.work -= job.remaining_time
+        return job
+
+    def top_key(self):
+        return self.heap[0][0]
+
+
+def multicore_scheduling(processes, policy='SJF', cpus=4, balancing='global'):
+    """Simulates FIFO, SJF, SRT or HRRN on several CPUs.
+
+    With balancing='global' all CPUs share one run queue. With 'steal'
+    every CPU has its own run queue: arrivals go to the least loaded CPU
+    and a CPU whose queue is empty steals the best job of the longest
+    queue. SRT preempts the running job with the most remaining time (or,
+    with per-CPU queues, the job on the same CPU).
+
+    Per-process metrics are written to processes. Returns
+    (cpu_timelines, cpu_utilization, stats), with one Timeline per CPU and
+    stats counting dispatches, preemptions, steals and migrations, where a
+    migration is a job resuming on a different CPU than it last ran on.
+    """
+    policy = policy.upper()
+    if policy not in POLICIES:
+        raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+    if balancing not in BALANCING:
+        raise ValueError(f"unknown balancing {balancing!r}, expected one of {BALANCING}")
+
+    n = len(processes)
+    pid, arrival, burst = read_columns(processes, ('pid', 'arrival_time', 'burst_time'))
+    start_time = [0] * n
+    completion_time = [0] * n
+    order = arrival_order(arrival)
+    if balancing == 'global':
+        shared = _RunQueue(policy)
+        queues = [shared] * cpus
+    else:
+        queues = [_RunQueue(policy) for _ in range(cpus)]
+
+    running = [None] * cpus  # Job on each CPU
+    run_start = [0] * cpus  # When the job on each CPU was dispatched
+    versions = [0] * cpus  # Invalidates completion events of preempted jobs
+    completions = []  # Min-heap of (end_time, cpu, version)
+    cpu_timelines = [Timeline() for _ in range(cpus)]
+    stats = {'dispatches': 0, 'preemptions': 0, 'steals': 0, 'migrations': 0}
+    total_busy_time = 0
+    next_arrival = 0  # Cursor into order
+    completed = 0
+    time = 0
+
+    def remaining_now(cpu):
+        return running[cpu].remaining_time - (time - run_start[cpu])
+
+    def dispatch(cpu, job):
+        running[cpu] = job
+        run_start[cpu] = time
+        versions[cpu] += 1
+        heapq.heappush(completions, (time + job.remaining_time, cpu, versions[cpu]))
+        stats['dispatches'] += 1
+        if job.last_cpu is not None and job.last_cpu != cpu:
+            stats['migrations'] += 1
+        job.last_cpu = cpu
+        if not job.started:
+            job.started = True
+            start_time[job.index] = time
+
+    def stop(cpu):
+        # Take the job off the CPU and record the run in its timeline
+        nonlocal total_busy_time
+        job = running[cpu]
+        job.remaining_time = remaining_now(cpu)
+        cpu_timelines[cpu].append(pid[job.index], run_start[cpu], time)
+        total_busy_time += time - run_start[cpu]
+        running[cpu] = None
+        versions[cpu] += 1
+        return job
+
+    while completed < n:
+        # Finish every job whose completion time has come
+        while completions and completions[0][0] <= time:
+            end_time, cpu, version = heapq.heappop(completions)
+            if version != versions[cpu]:
+                continue  # The job was preempted after this was scheduled
+            job = stop(cpu)
+            completion_time[job.index] = time
+            completed += 1
+
+        # Admit arrivals, each to the shared queue or the least loaded CPU
+        while next_arrival < n and arrival[order[next_arrival]] <= time:
+            i = order[next_arrival]
+            job = _Job(i, arrival[i], burst[i])
+            if balancing == 'global':
+                shared.push(job)
+            else:
+                target = min(range(cpus), key=lambda cpu: queues[cpu].work +
+                             (remaining_now(cpu) if running[cpu] is not None else 0))
+                queues[target].push(job)
+            next_arrival += 1
+
+        # Give every idle CPU work, stealing when its own queue is empty
+        for cpu in range(cpus):
+            if running[cpu] is not None:
+                continue
+            queue = queues[cpu]
+            if not queue:
+                if balancing == 'global':
+                    break
+                queue = max(queues, key=len)
+                if not queue:
+                    break  # Nothing is waiting on any CPU
+                stats['steals'] += 1
+            dispatch(cpu, queue.pop(time))
+
+        # SRT: a strictly shorter waiting job preempts a running one. On a
+        # full (remaining, arrival) tie the running job keeps its CPU.
+        if policy == 'SRT':
+            if balancing == 'global':
+                # Swap the longest running job for the shortest waiting one
+                # for as long as that is an improvement
+                while shared:
+                    cpu = max(range(cpus), key=lambda c: (remaining_now(c), running[c].arrival_time,
+                                                          running[c].index))
+                    if not shared.top_key()[:2] < (remaining_now(cpu), running[cpu].arrival_time):
+                        break
+                    stats['preemptions'] += 1
+                    shared.push(stop(cpu))
+                    dispatch(cpu, shared.pop(time))
+            else:
+                for cpu in range(cpus):
+                    queue = queues[cpu]
+                    if queue and queue.top_key()[:2] < (remaining_now(cpu), running[cpu].arrival_time):
+                        stats['preemptions'] += 1
+                        queue.push(stop(cpu))
+                        dispatch(cpu, queue.pop(time))
+
+        # Jump to the next arrival or completion
+        while completions and completions[0][2] != versions[completions[0][1]]:
+            heapq.heappop(completions)
+        next_times = []
+        if completions:
+            next_times.append(completions[0][0])
+        if next_arrival < n:
+            next_times.append(arrival[order[next_arrival]])
+        if not next_times:
+            break
+        time = max(time, min(next_times))
+
+    store_results(processes, start_time, completion_time)
+    makespan = time
+    cpu_utilization = (total_busy_time / (cpus * makespan)) * 100 if makespan else 0.0
+    return cpu_timelines, cpu_utilization, stats
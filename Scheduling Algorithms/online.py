@@ -0,0 +1,160 @@
+import heapq
+import math
+
+from events import COMPLETE, IDLE, IDLE_PID, PREEMPT, DispatchEvent
+from HRRN import ResponseRatioQueue
+
+POLICIES = ('FIFO', 'SJF', 'SRT', 'HRRN')
+
+
+class _Job:
+    __slots__ = ('pid', 'arrival_time', 'burst_time', 'remaining_time', 'start_time', 'seq')
+
+    def __init__(self, pid, arrival_time, burst_time, seq):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.start_time = -1
+        self.seq = seq
+
+
+class OnlineScheduler:
+    """Incremental FIFO/SJF/SRT/HRRN engine that accepts arrivals while running.
+
+    Processes are submitted at any simulated time and the simulation is
+    advanced in steps. Every arrival, dispatch and completion costs
+    O(log n) (for HRRN, O(log^2 b) amortized over b distinct burst times,
+    see ResponseRatioQueue); finished processes are folded into running
+    totals and forgotten. Ties go to the earlier submission.
+    """
+
+    def __init__(self, policy='SRT'):
+        policy = policy.upper()
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+        self.time = 0
+        self.pending = []  # Min-heap of (arrival_time, seq, job) not yet arrived
+        self.ready = ResponseRatioQueue() if policy == 'HRRN' else []
+        self.jobs = {}  # seq -> job, for processes in the ready structure
+        self.current = None  # Running job
+        self.run_start = 0
+        self.next_seq = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.total_busy_time = 0
+        self.total_waiting_time = 0
+        self.total_turnaround_time = 0
+        self.total_response_time = 0
+
+    def submit(self, process):
+        """Adds a process (pid, arrival_time, burst_time) to the simulation."""
+        if process.arrival_time < self.time:
+            raise ValueError(f"process {process.pid} arrives at {process.arrival_time}, "
+                             f"before the current time {self.time}")
+        job = _Job(process.pid, process.arrival_time, process.burst_time, self.next_seq)
+        self.next_seq += 1
+        self.submitted += 1
+        heapq.heappush(self.pending, (job.arrival_time, job.seq, job))
+
+    def _admit(self):
+        # Move every process that has arrived by now into the ready structure
+        while self.pending and self.pending[0][0] <= self.time:
+            job = heapq.heappop(self.pending)[2]
+            self._push_ready(job)
+
+    def _push_ready(self, job):
+        if self.policy == 'HRRN':
+            self.jobs[job.seq] = job
+            self.ready.push(job.arrival_time, job.burst_time, job.seq)
+        elif self.policy == 'FIFO':
+            heapq.heappush(self.ready, (job.arrival_time, job.seq, job))
+        elif self.policy == 'SJF':
+            heapq.heappush(self.ready, (job.burst_time, job.seq, job))
+        else:
+            heapq.heappush(self.ready, (job.remaining_time, job.arrival_time, job.seq, job))
+
+    def _pop_ready(self):
+        if self.policy == 'HRRN':
+            seq, burst_time = self.ready.pop_highest(self.time)
+            return self.jobs.pop(seq)
+        return heapq.heappop(self.ready)[-1]
+
+    def _should_preempt(self):
+        # SRT only: a strictly shorter (remaining, arrival) pair takes the CPU
+        if self.policy != 'SRT' or not self.ready:
+            return False
+        return self.ready[0][:2] < (self.current.remaining_time, self.current.arrival_time)
+
+    def advance(self, until=None):
+        """Simulates up to time until (or until all work is done if None).
+
+        Returns the DispatchEvents that ended during this step. A run that
+        is still in progress at until is reported once it ends.
+        """
+        limit = math.inf if until is None else until
+        events = []
+        while self.time < limit:
+            self._admit()
+
+            if self.current is None:
+                if not self.ready:
+                    next_arrival = self.pending[0][0] if self.pending else math.inf
+                    if next_arrival == math.inf and until is None:
+                        break
+                    # CPU is idle until the next arrival or the end of the step
+                    idle_until = min(next_arrival, limit)
+                    events.append(DispatchEvent(IDLE_PID, self.time, idle_until, IDLE))
+                    self.time = idle_until
+                    continue
+                self._dispatch(self._pop_ready())
+            elif self._should_preempt():
+                events.append(DispatchEvent(self.current.pid, self.run_start, self.time, PREEMPT))
+                self._push_ready(self.current)
+                self._dispatch(self._pop_ready())
+
+            # Run until completion, the end of the step or, for SRT, the next
+            # arrival that might preempt
+            run_until = min(self.time + self.current.remaining_time, limit)
+            if self.policy == 'SRT' and self.pending:
+                run_until = min(run_until, self.pending[0][0])
+            self.current.remaining_time -= run_until - self.time
+            self.total_busy_time += run_until - self.time
+            self.time = run_until
+
+            if self.current.remaining_time == 0:
+                events.append(DispatchEvent(self.current.pid, self.run_start, self.time, COMPLETE))
+                self._complete(self.current)
+                self.current = None
+        return events
+
+    def _dispatch(self, job):
+        self.current = job
+        self.run_start = self.time
+        if job.start_time == -1:
+            job.start_time = self.time
+
+    def _complete(self, job):
+        turnaround_time = self.time - job.arrival_time
+        self.completed += 1
+        self.total_turnaround_time += turnaround_time
+        self.total_waiting_time += turnaround_time - job.burst_time
+        self.total_response_time += job.start_time - job.arrival_time
+
+    def snapshot(self):
+        """Current time, queue sizes and averages over completed processes."""
+        completed = self.completed
+        return {
+            'time': self.time,
+            'submitted': self.submitted,
+            'completed': completed,
+            'pending': len(self.pending),
+            'ready': len(self.ready),
+            'running': self.current.pid if self.current is not None else None,
+            'avg_waiting': self.total_waiting_time / completed if completed else 0.0,
+            'avg_turnaround': self.total_turnaround_time / completed if completed else 0.0,
+            'avg_response': self.total_response_time / completed if completed else 0.0,
+            'cpu_utilization': self.total_busy_time / self.time * 100 if self.time else 0.0,
+        }
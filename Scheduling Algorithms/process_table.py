@@ -0,0 +1,216 @@
+import sys
+from time import perf_counter_ns
+
+import numpy as np
+
+from events import COMPLETE, IDLE, SWITCH
+from gantt import Timeline
+
+
+# Column names match the Process attributes, so a row view is a drop-in
+# replacement for a Process object in the scheduling functions
+INPUT_COLUMNS = ('pid', 'arrival_time', 'burst_time')
+RESULT_COLUMNS = ('start_time', 'completion_time', 'turnaround_time',
+                  'waiting_time', 'response_time', 'remaining_time')
+COLUMNS = INPUT_COLUMNS + RESULT_COLUMNS
+
+
+class ProcessTable:
+    """A set of processes stored as one NumPy int64 column per field.
+
+    The input columns are used as given when they already are int64 arrays,
+    so a mapped trace is not copied. Result columns are allocated on first
+    use.
+    """
+
+    def __init__(self, pid, arrival_time, burst_time):
+        self.pid = np.asarray(pid, dtype=np.int64)
+        self.arrival_time = np.asarray(arrival_time, dtype=np.int64)
+        self.burst_time = np.asarray(burst_time, dtype=np.int64)
+        n = len(self.pid)
+        if len(self.arrival_time) != n or len(self.burst_time) != n:
+            raise ValueError("pid, arrival_time and burst_time must have the same length")
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: allocate a result column
+        if name not in RESULT_COLUMNS:
+            raise AttributeError(f"'ProcessTable' object has no attribute {name!r}")
+        if name == 'start_time':
+            column = np.full(len(self.pid), -1, dtype=np.int64)  # -1 until first dispatch
+        elif name == 'remaining_time':
+            column = np.array(self.burst_time, dtype=np.int64)
+        else:
+            column = np.zeros(len(self.pid), dtype=np.int64)
+        setattr(self, name, column)
+        return column
+
+    @classmethod
+    def from_processes(cls, processes):
+        return cls([p.pid for p in processes],
+                   [p.arrival_time for p in processes],
+                   [p.burst_time for p in processes])
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("process index out of range")
+        return ProcessRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ProcessRow(self, index)
+
+    def copy(self):
+        # np.asarray would share the input columns with this table
+        table = ProcessTable(self.pid.copy(), self.arrival_time.copy(), self.burst_time.copy())
+        for name in self._allocated():
+            setattr(table, name, getattr(self, name).copy())
+        return table
+
+    def without_results(self):
+        """A table of the same processes that shares the input columns, with no results yet."""
+        return ProcessTable(self.pid, self.arrival_time, self.burst_time)
+
+    def _allocated(self):
+        # Result columns in use so far
+        return [name for name in RESULT_COLUMNS if name in self.__dict__]
+
+    def derive_metrics(self):
+        """Fills turnaround, waiting and response times from start and completion times."""
+        # In place, so result columns mapped from a trace file stay mapped
+        np.subtract(self.completion_time, self.arrival_time, out=self.turnaround_time)
+        np.subtract(self.turnaround_time, self.burst_time, out=self.waiting_time)
+        np.subtract(self.start_time, self.arrival_time, out=self.response_time)
+
+    def sort(self, key=None):
+        # Stable in-place reorder of every column, like list.sort()
+        if key is None:
+            order = np.argsort(self.arrival_time, kind='stable')
+        else:
+            order = np.array(sorted(range(len(self)), key=lambda i: key(ProcessRow(self, i))),
+                             dtype=np.int64)
+        for name in INPUT_COLUMNS + tuple(self._allocated()):
+            setattr(self, name, getattr(self, name)[order])
+
+
+def _column_property(name):
+    def getter(row):
+        return int(getattr(row.table, name)[row.index])
+
+    def setter(row, value):
+        getattr(row.table, name)[row.index] = value
+
+    return property(getter, setter)
+
+
+class ProcessRow:
+    """Lightweight view of one row of a ProcessTable with Process attributes."""
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)}" for name in COLUMNS)
+        return f"ProcessRow({fields})"
+
+
+for _name in COLUMNS:
+    setattr(ProcessRow, _name, _column_property(_name))
+del _name
+
+
+def read_columns(processes, names=('arrival_time', 'burst_time')):
+    # Columns (arrival and burst times by default) as plain lists, without a
+    # per-row lookup for tables
+    if isinstance(processes, ProcessTable):
+        return tuple(getattr(processes, name).tolist() for name in names)
+    return tuple([getattr(p, name) for p in processes] for name in names)
+
+
+def arrival_order(arrival_time):
+    # Indices by arrival; the stable sort keeps list order for equal arrivals
+    return sorted(range(len(arrival_time)), key=arrival_time.__getitem__)
+
+
+def run_events(processes, events_fn, profiler=None, finished=False):
+    """Runs an event engine over processes and stores its results in place.
+
+    events_fn takes the (index, arrival_time, burst_time) triples in arrival
+    order and returns DispatchEvents; list indices stand in for pids, so ties
+    resolve by list position. Only the start and completion times are kept
+    while consuming, and store_results derives the rest (finished is passed
+    on). Idle and switch time is left out of the Gantt chart and the busy
+    time. With a profiler, recording results and building the Gantt chart
+    count as 'bookkeeping'. Returns (gantt_chart, cpu_utilization).
+    """
+    n = len(processes)
+    pid, arrival, burst = read_columns(processes, ('pid', 'arrival_time', 'burst_time'))
+    start_time = [-1] * n
+    completion_time = [0] * n
+    time = 0
+    gantt_chart = Timeline()
+    total_busy_time = 0
+
+    events = events_fn((i, arrival[i], burst[i]) for i in arrival_order(arrival))
+    for i, start, end, reason in events:
+        time = end
+        if reason == IDLE or reason == SWITCH:
+            continue
+        if profiler is not None:
+            bookkeeping_started = perf_counter_ns()
+        if start_time[i] == -1:
+            start_time[i] = start
+        gantt_chart.append(pid[i], start, end)
+        total_busy_time += end - start
+        if reason == COMPLETE:
+            completion_time[i] = end
+        if profiler is not None:
+            profiler.add_ns('bookkeeping', perf_counter_ns() - bookkeeping_started)
+
+    if profiler is not None:
+        bookkeeping_started = perf_counter_ns()
+    store_results(processes, start_time, completion_time, finished)
+    if profiler is not None:
+        profiler.add_ns('bookkeeping', perf_counter_ns() - bookkeeping_started)
+    cpu_utilization = (total_busy_time / time) * 100 if time else 0.0
+    return gantt_chart, cpu_utilization
+
+
+def store_results(processes, start_time, completion_time, finished=False):
+    """Writes start and completion times by position and derives the other metrics.
+
+    Engines only record the two times while scheduling. A ProcessTable gets
+    them as whole columns and derive_metrics(); Process objects are updated
+    in one pass afterwards. finished also zeroes remaining_time.
+    """
+    if isinstance(processes, ProcessTable):
+        processes.start_time[:] = start_time
+        processes.completion_time[:] = completion_time
+        processes.derive_metrics()
+        if finished:
+            processes.remaining_time[:] = 0
+        return
+    for process, start, completion in zip(processes, start_time, completion_time):
+        process.start_time = start
+        process.response_time = start - process.arrival_time
+        process.completion_time = completion
+        process.turnaround_time = completion - process.arrival_time
+        process.waiting_time = process.turnaround_time - process.burst_time
+        if finished:
+            process.remaining_time = 0
+
+
+def print_rows(processes, names, row_format, stream=None):
+    """Writes the names columns of every process with one write call.
+
+    row_format has one {} field per column, e.g. "{}\t{}\t{}".
+    """
+    text = "".join(map((row_format + "\n").format, *read_columns(processes, names)))
+    (stream or sys.stdout).write(text)
@@ -0,0 +1,170 @@
+"""Opt-in instrumentation for the scheduling engines.
+
+Engines that take a profiler argument count their dispatches, context
+switches and idle skips and time their phases in nanoseconds when one is
+passed; with the default None they only pay for an `is not None` test.
+
+    profiler = Profiler()
+    SRT_scheduling(processes, profiler=profiler)
+    print(profiler.to_json())
+
+The whole run can also go through cProfile, or through perf with
+Python 3.12+ stack trampolines:
+
+    python profiling.py workload.csv -e SRT HRRN RR -o counters.json
+    python profiling.py workload.csv -e SRT_event_driven --cprofile srt.prof
+"""
+import argparse
+import cProfile
+import inspect
+import json
+import pstats
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+
+class Profiler:
+    """Named event counters and nanosecond phase timers."""
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timers_ns = Counter()
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def add_ns(self, name, elapsed_ns):
+        self.timers_ns[name] += elapsed_ns
+
+    @contextmanager
+    def phase(self, name):
+        started = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timers_ns[name] += perf_counter_ns() - started
+
+    def merge(self, other):
+        self.counters.update(other.counters)
+        self.timers_ns.update(other.timers_ns)
+
+    def as_dict(self):
+        return {'counters': dict(self.counters), 'timers_ns': dict(self.timers_ns)}
+
+    def to_json(self, output=None):
+        """Returns the JSON text, or writes it to output (a path or stream)."""
+        text = json.dumps(self.as_dict(), indent=2, sort_keys=True)
+        if output is None:
+            return text
+        if isinstance(output, str):
+            with open(output, 'w') as stream:
+                stream.write(text + "\n")
+        else:
+            output.write(text + "\n")
+
+
+class TimedTracer:
+    """Wraps a PCB Tracer and adds the time spent emitting to a profiler timer."""
+
+    def __init__(self, tracer, profiler, timer='output'):
+        self.tracer = tracer
+        self.level = tracer.level
+        self.profiler = profiler
+        self.timer = timer
+
+    def emit(self, record):
+        started = perf_counter_ns()
+        self.tracer.emit(record)
+        self.profiler.timers_ns[self.timer] += perf_counter_ns() - started
+
+    def close(self):
+        with self.profiler.phase(self.timer):
+            self.tracer.close()
+
+
+@contextmanager
+def profiled(mode='cprofile', output=None, sort='cumulative', limit=30):
+    """Runs the body under cProfile, or with perf stack trampolines.
+
+    In cprofile mode the stats are dumped to output for pstats/snakeviz,
+    or the top limit entries are printed to stderr. In perf mode Python
+    functions show up by name in `perf record` (Python 3.12+ only).
+    """
+    if mode == 'perf':
+        if not hasattr(sys, 'activate_stack_trampoline'):
+            raise RuntimeError("perf mode needs Python 3.12 or newer")
+        sys.activate_stack_trampoline('perf')
+        try:
+            yield
+        finally:
+            sys.deactivate_stack_trampoline()
+        return
+    if mode != 'cprofile':
+        raise ValueError(f"unknown profiling mode: {mode}")
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        if output is not None:
+            profile.dump_stats(output)
+        else:
+            pstats.Stats(profile, stream=sys.stderr).sort_stats(sort).print_stats(limit)
+
+
+def accepts_profiler(engine):
+    return 'profiler' in inspect.signature(engine).parameters
+
+
+def parse_args(argv=None):
+    from benchmark import ENGINES
+
+    parser = argparse.ArgumentParser(description="Profile the scheduling engines on a workload.")
+    parser.add_argument('input', help="workload file (CSV, JSON Lines or .trace), or - for stdin")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl', 'trace'),
+                        help="workload format (default: from the file extension, csv for stdin)")
+    parser.add_argument('-e', '--engines', nargs='+', choices=list(ENGINES), default=['SRT_event_driven'],
+                        help="engines to profile (default: SRT_event_driven)")
+    parser.add_argument('-o', '--output', default='-', help="counters as JSON here (default: stdout)")
+    parser.add_argument('--cprofile', metavar='PATH', help="also run under cProfile and dump the stats here")
+    parser.add_argument('--perf', action='store_true', help="enable perf stack trampolines (Python 3.12+)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from batch import load_workload
+    from benchmark import ENGINES
+
+    args = parse_args(argv)
+    table = load_workload(args.input, args.input_format)
+
+    results = {}
+    for name in args.engines:
+        engine, setup, max_size = ENGINES[name]
+        arguments = setup(table)
+        profiler = Profiler()
+        keywords = {'profiler': profiler} if accepts_profiler(engine) else {}
+        if args.cprofile or args.perf:
+            output = f"{args.cprofile}.{name}" if args.cprofile and len(args.engines) > 1 else args.cprofile
+            with profiled('perf' if args.perf else 'cprofile', output):
+                with profiler.phase('total'):
+                    engine(arguments, **keywords)
+        else:
+            with profiler.phase('total'):
+                engine(arguments, **keywords)
+        results[name] = profiler.as_dict()
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as stream:
+            stream.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import FIFO
+import HRRN
+import MLFQ
+import SJF
+import SRT
+from cache import default_cache
+from metrics import MetricsAggregator
+
+
+# Scheduler entry points by name; each takes a process list or ProcessTable
+# and returns (gantt_chart, cpu_utilization)
+ALGORITHMS = {
+    'FIFO': FIFO.FIFO_scheduling_vectorized,
+    'SRT': SRT.SRT_scheduling_event_driven,
+    'SJF': SJF.SJF_scheduling_heap,
+    'HRRN': HRRN.HRRN_scheduling_bucketed,
+    'MLFQ': MLFQ.MLFQ_scheduling,
+}
+
+# Modules owning each algorithm, for their print_processes/plot_gantt_chart
+MODULES = {
+    'FIFO': FIFO,
+    'SRT': SRT,
+    'SJF': SJF,
+    'HRRN': HRRN,
+    'MLFQ': MLFQ,
+}
+
+
+def run_algorithm(name, table, cache=None):
+    """Runs one scheduler on its own copy of a ProcessTable.
+
+    Results are looked up in and saved to cache, a ResultCache; by default
+    the one named by SCHEDULER_CACHE_DIR, if that is set.
+    """
+    table = table.copy()
+    if cache is None:
+        cache = default_cache()
+    if cache is None:
+        gantt_chart, cpu_utilization = ALGORITHMS[name](table)
+        return table, gantt_chart, cpu_utilization
+
+    key = cache.key(table, name)
+    cached = cache.get(key, table)
+    if cached is not None and cached[0] is not None:  # A summary entry has no chart
+        return (table,) + cached
+    gantt_chart, cpu_utilization = ALGORITHMS[name](table)
+    cache.put(key, table, gantt_chart, cpu_utilization)
+    return table, gantt_chart, cpu_utilization
+
+
+def summarize(table, cpu_utilization):
+    """Aggregate metrics of a scheduled ProcessTable."""
+    metrics = MetricsAggregator()
+    metrics.record_table(table)
+    summary = metrics.report()
+    summary['makespan'] = int(table.completion_time.max()) if len(table) else 0
+    summary['cpu_utilization'] = cpu_utilization
+    return summary
@@ -0,0 +1,253 @@
+"""Parameter sweeps over the schedulers.
+
+Runs every combination of a parameter grid (algorithm, RR quantum, CPU
+count, load balancing, ...) in worker processes that read the workload from
+one shared memory block instead of receiving a pickled copy each.
+
+    python sweep.py workload.csv -a RR SRT --quantum 1 2 4 8 --cpus 1 2 4 -j 8
+    python sweep.py workload.csv -a RR --quantum 1 2 4 8 --switch-cost 0 1 2
+"""
+import argparse
+import csv
+import inspect
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch import load_workload, workload_format
+from cache import ResultCache, default_cache
+from MLFQ import MLFQ_scheduling
+from multicore import POLICIES as MULTICORE_POLICIES, multicore_scheduling
+from process_table import ProcessTable
+from profiling import Profiler, accepts_profiler
+from schedulers import ALGORITHMS, summarize
+from SRT import SRT_scheduling_event_driven
+from tracefile import open_trace
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                             'Program Control Block'))
+
+import PCB  # noqa: E402
+
+
+def _run_round_robin(table, quantum=4, cpus=1, balancing='global', switch_cost=0, dispatch_cost=0,
+                     profiler=None):
+    # Processes join the ready queue at their arrival times, as in the other policies
+    processes = PCB.processes_from_table(table, quantum)
+    if cpus > 1:
+        return PCB.multicore_round_robin_scheduler(processes, cpus, balancing,
+                                                   use_arrival_times=True)[1]
+    stats = PCB.round_robin_scheduler(processes, profiler=profiler, switch_cost=switch_cost,
+                                      dispatch_cost=dispatch_cost, use_arrival_times=True)
+    return stats['cpu_utilization']
+
+
+def _policy_runner(name):
+    def run(table, cpus=1, balancing='global'):
+        if cpus > 1:
+            return multicore_scheduling(table, name, cpus, balancing)[1]
+        return ALGORITHMS[name](table)[1]
+    return run
+
+
+def _run_srt(table, cpus=1, balancing='global', switch_cost=0, dispatch_cost=0, profiler=None):
+    if cpus > 1:
+        return multicore_scheduling(table, 'SRT', cpus, balancing)[1]
+    return SRT_scheduling_event_driven(table, profiler, switch_cost, dispatch_cost)[1]
+
+
+def _run_mlfq(table, quantum=2, levels=3, boost_interval=None, aging_threshold=None):
+    # Level i gets an allotment of quantum * 2**i
+    quanta = tuple(quantum * 2**level for level in range(levels))
+    return MLFQ_scheduling(table, quanta, boost_interval, aging_threshold)[1]
+
+
+# Sweepable policies; each schedules a ProcessTable in place, takes its
+# parameters as keywords and returns the CPU utilization
+POLICIES = {'RR': _run_round_robin, 'MLFQ': _run_mlfq}
+POLICIES.update((name, _policy_runner(name)) for name in ALGORITHMS if name in MULTICORE_POLICIES)
+POLICIES['SRT'] = _run_srt
+
+SWITCH_COSTS = ('switch_cost', 'dispatch_cost')
+
+# Summary columns taken from the profiler of policies that accept one
+SWITCH_COUNTERS = ('context_switches', 'switch_overhead')
+
+
+def grid_points(grid):
+    """Expands {parameter: values} into one dict per combination.
+
+    grid['algorithm'] lists the policies; every other parameter is only
+    varied for the policies that take it, so no point is run twice.
+    """
+    points = []
+    for algorithm in grid['algorithm']:
+        accepted = inspect.signature(POLICIES[algorithm]).parameters
+        names = [name for name in grid if name != 'algorithm' and name in accepted]
+        for values in itertools.product(*(grid[name] for name in names)):
+            point = {'algorithm': algorithm, **dict(zip(names, values))}
+            # Balancing makes no difference on a single CPU, and switch
+            # costs are only modelled on one
+            if point.get('cpus') == 1 and 'balancing' in point and point['balancing'] != grid['balancing'][0]:
+                continue
+            if point.get('cpus', 1) > 1 and any(point[name] != grid[name][0] for name in SWITCH_COSTS
+                                                if name in point):
+                continue
+            points.append(point)
+    return points
+
+
+def evaluate(table, point, cache=None):
+    """Runs one grid point on table's processes and returns its summary row.
+
+    The result is looked up in and saved to cache, a ResultCache keyed by
+    the workload, the algorithm and the rest of point; by default the one
+    in $SCHEDULER_CACHE_DIR, if set. These entries have no Gantt chart, so
+    they are marked as summaries and never shadow a run_algorithm entry.
+    """
+    table = table.without_results()  # A mapped trace stays mapped
+    params = dict(point)
+    name = params.pop('algorithm')
+    policy = POLICIES[name]
+    profiler = Profiler() if accepts_profiler(policy) else None
+    if cache is None:
+        cache = default_cache()
+    cached = None
+    if cache is not None:
+        key = cache.key(table, name, summary=True, **params)
+        cached = cache.get(key, table, profiler)
+    if cached is not None:
+        cpu_utilization = cached[1]
+    else:
+        if profiler is None:
+            cpu_utilization = policy(table, **params)
+        else:
+            cpu_utilization = policy(table, profiler=profiler, **params)
+        if cache is not None:
+            cache.put(key, table, None, cpu_utilization, profiler)
+    row = {**point, **summarize(table, cpu_utilization)}
+    if profiler is not None and profiler.counters:  # Not on several CPUs
+        row.update((name, profiler.counters[name]) for name in SWITCH_COUNTERS)
+    return row
+
+
+_shared_table = None  # Workload of a worker process, backed by shared memory
+_shared_block = None
+
+
+def _attach(name, n):
+    global _shared_table, _shared_block
+    _shared_block = shared_memory.SharedMemory(name=name)
+    columns = np.ndarray((3, n), dtype=np.int64, buffer=_shared_block.buf)
+    columns.flags.writeable = False
+    _shared_table = ProcessTable(columns[0], columns[1], columns[2])
+
+
+def _attach_trace(path):
+    # Every worker maps the same file, so they share its page cache
+    global _shared_table
+    _shared_table = open_trace(path)
+
+
+def _evaluate_shared(point, cache=None):
+    return evaluate(_shared_table, point, cache)
+
+
+def sweep(table, grid, max_workers=None, cache=None):
+    """Evaluates every point of grid on table, in parallel when max_workers != 1.
+
+    table is a ProcessTable, or the path of a trace file that the workers
+    map directly. Points are cached as in evaluate. Returns one summary row
+    per point, in grid_points order.
+    """
+    points = grid_points(grid)
+    task = partial(_evaluate_shared, cache=cache)
+    if max_workers == 1:
+        if isinstance(table, str):
+            table = open_trace(table)
+        return [evaluate(table, point, cache) for point in points]
+    if isinstance(table, str):
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_trace,
+                                 initargs=(table,)) as pool:
+            return list(pool.map(task, points))
+
+    n = len(table)
+    block = shared_memory.SharedMemory(create=True, size=max(1, 3 * n * 8))
+    try:
+        columns = np.ndarray((3, n), dtype=np.int64, buffer=block.buf)
+        columns[0], columns[1], columns[2] = table.pid, table.arrival_time, table.burst_time
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                 initargs=(block.name, n)) as pool:
+            return list(pool.map(task, points))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep scheduler parameters over a workload.")
+    parser.add_argument('input', help="workload file with pid, arrival and burst columns, or - for stdin")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl', 'trace'),
+                        help="workload format (default: from the file extension, csv for stdin)")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=list(POLICIES), default=list(POLICIES),
+                        type=str.upper, help="policies to sweep (default: all)")
+    parser.add_argument('--quantum', nargs='+', type=int, default=[4],
+                        help="RR quantum sizes, and MLFQ top level allotments")
+    parser.add_argument('--cpus', nargs='+', type=int, default=[1], help="CPU counts")
+    parser.add_argument('--balancing', nargs='+', choices=('global', 'steal'), default=['global'],
+                        help="load balancing modes for more than one CPU")
+    parser.add_argument('--levels', nargs='+', type=int, default=[3], help="MLFQ levels")
+    parser.add_argument('--boost-interval', nargs='+', type=int, default=[None],
+                        help="MLFQ priority boost intervals (default: no boost)")
+    parser.add_argument('--aging-threshold', nargs='+', type=int, default=[None],
+                        help="MLFQ aging thresholds (default: no aging)")
+    parser.add_argument('--switch-cost', nargs='+', type=int, default=[0],
+                        help="RR and SRT context switch costs, on a single CPU (default: 0)")
+    parser.add_argument('--dispatch-cost', nargs='+', type=int, default=[0],
+                        help="RR and SRT per-dispatch costs, on a single CPU (default: 0)")
+    parser.add_argument('-f', '--format', choices=('csv', 'json'), default='csv')
+    parser.add_argument('-o', '--output', default='-', help="output file (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--cache-dir',
+                        help="reuse results cached here (default: $SCHEDULER_CACHE_DIR, if set)")
+    return parser.parse_args(argv)
+
+
+def write_rows(stream, rows, output_format):
+    if output_format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=list(dict.fromkeys(k for row in rows for k in row)))
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            stream.write(json.dumps(row) + "\n")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if workload_format(args.input, args.input_format) == 'trace':
+        table = args.input  # Mapped by the workers themselves
+    else:
+        table = load_workload(args.input, args.input_format)
+
+    grid = {'algorithm': args.algorithms, 'quantum': args.quantum, 'cpus': args.cpus,
+            'balancing': args.balancing, 'levels': args.levels,
+            'boost_interval': args.boost_interval, 'aging_threshold': args.aging_threshold,
+            'switch_cost': args.switch_cost, 'dispatch_cost': args.dispatch_cost}
+    cache = ResultCache(args.cache_dir) if args.cache_dir is not None else None
+    rows = sweep(table, grid, args.workers, cache)
+    if args.output == '-':
+        write_rows(sys.stdout, rows, args.format)
+    else:
+        with open(args.output, 'w', newline='') as stream:
+            write_rows(stream, rows, args.format)
+
+
+if __name__ == "__main__":
+    main()
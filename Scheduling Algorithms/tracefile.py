@@ -0,0 +1,109 @@
+"""Binary columnar workload traces, opened with numpy.memmap.
+
+Layout, all little-endian:
+
+    header   64 bytes: magic b'SCHDTRC1', format version (uint32), flags
+             (uint32, bit 0 set when result columns are present), process
+             count n (uint64), zero padding
+    columns  n int64 values per column: pid, arrival_time, burst_time,
+             then, if present, every column of RESULT_COLUMNS
+
+Opening a trace maps the columns without parsing or copying, so the page
+cache holds a single copy however many processes read it. To convert a
+CSV or JSON Lines workload:
+
+    python tracefile.py workload.csv workload.trace
+"""
+import argparse
+import struct
+
+import numpy as np
+
+from process_table import INPUT_COLUMNS, RESULT_COLUMNS, ProcessTable
+
+MAGIC = b'SCHDTRC1'
+VERSION = 1
+HAS_RESULTS = 1
+HEADER = struct.Struct('<8sIIQ')
+HEADER_SIZE = 64
+ITEM_SIZE = 8  # int64
+
+
+def _read_header(path):
+    with open(path, 'rb') as stream:
+        magic, version, flags, n = HEADER.unpack(stream.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a workload trace")
+    if version != VERSION:
+        raise ValueError(f"{path} has unsupported trace version {version}")
+    return flags, n
+
+
+def _write_header(stream, flags, n):
+    stream.write(HEADER.pack(MAGIC, VERSION, flags, n).ljust(HEADER_SIZE, b'\0'))
+
+
+def _column(path, index, n, mode):
+    # int64 view of the index-th column
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)  # mmap cannot map an empty range
+    return np.memmap(path, dtype='<i8', mode=mode, offset=HEADER_SIZE + index * n * ITEM_SIZE,
+                     shape=(n,))
+
+
+def write_trace(path, table, results=False):
+    """Saves the input columns of table, and its result columns with results=True."""
+    columns = INPUT_COLUMNS + (RESULT_COLUMNS if results else ())
+    with open(path, 'wb') as stream:
+        _write_header(stream, HAS_RESULTS if results else 0, len(table))
+        for name in columns:
+            stream.write(np.ascontiguousarray(getattr(table, name), dtype='<i8').tobytes())
+
+
+def open_trace(path, mode='r'):
+    """Maps a trace as a ProcessTable without copying its columns.
+
+    With mode='r+' on a trace that has result columns, the table's result
+    columns are mapped too, so a scheduler run on it writes its results
+    straight into the file. Otherwise they are in-memory arrays, allocated
+    only once something uses them.
+    """
+    flags, n = _read_header(path)
+    input_mode = 'r' if mode == 'r' else 'r+'
+    table = ProcessTable(*(_column(path, i, n, input_mode) for i in range(len(INPUT_COLUMNS))))
+    if flags & HAS_RESULTS and mode == 'r+':
+        for i, name in enumerate(RESULT_COLUMNS, start=len(INPUT_COLUMNS)):
+            setattr(table, name, _column(path, i, n, 'r+'))
+    return table
+
+
+def write_results(path, table):
+    """Stores the result columns of table in an existing trace of the same workload."""
+    flags, n = _read_header(path)
+    if n != len(table):
+        raise ValueError(f"{path} holds {n} processes, the table {len(table)}")
+    if not flags & HAS_RESULTS:
+        # Grow the file by the result columns and mark them present
+        with open(path, 'r+b') as stream:
+            stream.truncate(HEADER_SIZE + len(INPUT_COLUMNS + RESULT_COLUMNS) * n * ITEM_SIZE)
+            _write_header(stream, flags | HAS_RESULTS, n)
+    for i, name in enumerate(RESULT_COLUMNS, start=len(INPUT_COLUMNS)):
+        column = _column(path, i, n, 'r+')
+        column[:] = getattr(table, name)
+        column.flush()
+
+
+def main(argv=None):
+    from batch import load_workload
+
+    parser = argparse.ArgumentParser(description="Convert a CSV or JSON Lines workload to a trace file.")
+    parser.add_argument('input', help="workload file with pid, arrival and burst columns")
+    parser.add_argument('output', help="trace file to write")
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'),
+                        help="workload format (default: from the file extension)")
+    args = parser.parse_args(argv)
+    write_trace(args.output, load_workload(args.input, args.input_format))
+
+
+if __name__ == "__main__":
+    main()
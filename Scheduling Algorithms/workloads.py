@@ -0,0 +1,66 @@
+"""Seeded synthetic workloads for benchmarks and experiments.
+
+Every generator takes a numpy Generator and returns an int64 array, so the
+same seed always gives the same workload.
+
+    table = generate(100000, arrivals='bursty', bursts='pareto', load=0.9, seed=1)
+"""
+import numpy as np
+
+from process_table import ProcessTable
+
+
+def exponential_bursts(rng, n, mean=10):
+    return np.maximum(1, np.rint(rng.exponential(mean, n))).astype(np.int64)
+
+
+def bimodal_bursts(rng, n, short=2, long=50, long_fraction=0.1):
+    # Mostly short interactive jobs with a few long batch jobs
+    is_long = rng.random(n) < long_fraction
+    bursts = np.where(is_long, rng.poisson(long, n), rng.poisson(short, n))
+    return np.maximum(1, bursts).astype(np.int64)
+
+
+def pareto_bursts(rng, n, alpha=1.5, minimum=1, maximum=10**6):
+    # Heavy tailed: a handful of jobs carry a large share of the work
+    bursts = minimum * (1 + rng.pareto(alpha, n))
+    return np.clip(np.rint(bursts), minimum, maximum).astype(np.int64)
+
+
+def poisson_arrivals(rng, n, rate):
+    gaps = rng.exponential(1 / rate, n)
+    return np.floor(np.cumsum(gaps)).astype(np.int64)
+
+
+def bursty_arrivals(rng, n, rate, batch_mean=20):
+    # Batches of simultaneous arrivals, with batches arriving as a Poisson
+    # process slow enough to keep the overall rate
+    batch_sizes = 1 + rng.poisson(batch_mean - 1, n)
+    batch_of = np.repeat(np.arange(n), batch_sizes)[:n]
+    batch_times = poisson_arrivals(rng, batch_of[-1] + 1, rate / batch_mean) if n else batch_of
+    return batch_times[batch_of]
+
+
+BURSTS = {
+    'exponential': exponential_bursts,
+    'bimodal': bimodal_bursts,
+    'pareto': pareto_bursts,
+}
+
+ARRIVALS = {
+    'poisson': poisson_arrivals,
+    'bursty': bursty_arrivals,
+}
+
+
+def generate(n, arrivals='poisson', bursts='exponential', load=0.9, seed=0):
+    """Builds a ProcessTable of n processes sorted by arrival time.
+
+    The arrival rate is chosen so the offered load (arrival rate times mean
+    burst time) is load; above 1 the ready queue grows without bound.
+    """
+    rng = np.random.default_rng(seed)
+    burst_time = BURSTS[bursts](rng, n)
+    rate = load / burst_time.mean() if n else 1.0
+    arrival_time = ARRIVALS[arrivals](rng, n, rate)
+    return ProcessTable(np.arange(1, n + 1), arrival_time, burst_time)
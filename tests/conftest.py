@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules import their siblings by name, as when run from their folders
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, os.path.join(ROOT, 'Scheduling Algorithms'))
+sys.path.insert(0, os.path.join(ROOT, 'Program Control Block'))
@@ -0,0 +1,26 @@
+"""load_workload on every input format."""
+import io
+import json
+
+import numpy as np
+
+from batch import load_workload
+from tracefile import write_trace
+from workloads import generate
+
+
+def test_every_format_loads_the_same_table(tmp_path, monkeypatch):
+    table = generate(100, seed=6)
+    rows = list(zip(table.pid.tolist(), table.arrival_time.tolist(), table.burst_time.tolist()))
+    csv_text = 'pid,arrival,burst\n' + ''.join(f"{p},{a},{b}\n" for p, a, b in rows)
+    (tmp_path / 'workload.csv').write_text(csv_text)
+    (tmp_path / 'workload.txt').write_text(
+        ''.join(json.dumps({'pid': p, 'arrival_time': a, 'burst_time': b}) + '\n' for p, a, b in rows))
+    write_trace(str(tmp_path / 'workload.trace'), table)
+    monkeypatch.setattr('sys.stdin', io.StringIO(csv_text))
+
+    for path, input_format in (('workload.csv', None), ('workload.txt', 'jsonl'),
+                               ('workload.trace', None), ('-', None)):
+        loaded = load_workload(path if path == '-' else str(tmp_path / path), input_format)
+        for name in ('pid', 'arrival_time', 'burst_time'):
+            assert np.array_equal(getattr(loaded, name), getattr(table, name)), (path, name)
@@ -0,0 +1,95 @@
+"""ResultCache hits, misses, key separation and LRU eviction."""
+import os
+
+import numpy as np
+import pytest
+
+import cache as cache_module
+from cache import ResultCache
+from process_table import RESULT_COLUMNS
+from schedulers import run_algorithm
+from sweep import sweep
+from workloads import generate
+
+
+@pytest.fixture
+def table():
+    return generate(200, seed=1)
+
+
+def entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.npz'))
+
+
+def test_hit_returns_the_stored_results(tmp_path, table):
+    cache = ResultCache(str(tmp_path))
+    expected_table, expected_gantt, expected_utilization = run_algorithm('SJF', table, cache)
+    assert len(entries(tmp_path)) == 1
+
+    cached_table, gantt_chart, cpu_utilization = run_algorithm('SJF', table, cache)
+    assert list(gantt_chart) == list(expected_gantt)
+    assert cpu_utilization == expected_utilization
+    for name in RESULT_COLUMNS:
+        assert np.array_equal(getattr(cached_table, name), getattr(expected_table, name)), name
+    assert len(entries(tmp_path)) == 1
+
+
+def test_miss_returns_none(tmp_path, table):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get(cache.key(table, 'SJF'), table.copy()) is None
+
+
+def test_keys_separate_workloads_algorithms_and_params(table):
+    cache = ResultCache.__new__(ResultCache)  # key() needs no directory
+    other = table.copy()
+    other.burst_time = other.burst_time + 1
+    keys = [cache.key(table, 'SJF'), cache.key(other, 'SJF'), cache.key(table, 'HRRN'),
+            cache.key(table, 'RR', quantum=2), cache.key(table, 'RR', quantum=4),
+            cache.key(table, 'SJF', summary=True)]
+    assert len(set(keys)) == len(keys)
+    assert cache.key(table, 'RR', quantum=2, cpus=1) == cache.key(table, 'RR', cpus=1, quantum=2)
+
+
+def test_sweep_entries_do_not_shadow_run_algorithm(tmp_path, table):
+    cache = ResultCache(str(tmp_path))
+    sweep(table, {'algorithm': ['SJF']}, 1, cache)
+    _, gantt_chart, _ = run_algorithm('SJF', table, cache)
+    assert gantt_chart is not None and len(gantt_chart)
+    _, cached_gantt, _ = run_algorithm('SJF', table, cache)
+    assert list(cached_gantt) == list(gantt_chart)
+
+
+def test_sweep_hits_return_the_same_rows(tmp_path, table):
+    cache = ResultCache(str(tmp_path))
+    grid = {'algorithm': ['SRT', 'RR'], 'quantum': [2, 4], 'switch_cost': [0, 1]}
+    uncached = sweep(table, grid, 1)
+    assert sweep(table, grid, 1, cache) == uncached
+    stored = entries(tmp_path)
+    assert sweep(table, grid, 1, cache) == uncached
+    assert entries(tmp_path) == stored
+
+
+def test_eviction_drops_least_recently_used(tmp_path, table):
+    cache = ResultCache(str(tmp_path))
+    keys = {}
+    for age, name in enumerate(('FIFO', 'SJF', 'HRRN')):
+        run_algorithm(name, table, cache)
+        keys[name] = cache.key(table, name)
+        os.utime(cache._path(keys[name]), (age, age))
+    cache.get(keys['FIFO'], table.copy())  # Now the most recently used
+    sizes = {name: os.path.getsize(cache._path(key)) for name, key in keys.items()}
+
+    cache.max_bytes = sizes['FIFO'] + sizes['HRRN']
+    cache.evict()
+    assert entries(tmp_path) == sorted([keys['FIFO'] + '.npz', keys['HRRN'] + '.npz'])
+
+
+def test_entry_evicted_while_read_is_still_returned(tmp_path, table, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    _, expected_gantt, _ = run_algorithm('SJF', table, cache)
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(cache_module.os, 'utime', evicted)
+    cached = cache.get(cache.key(table, 'SJF'), table.copy())
+    assert cached is not None and list(cached[0]) == list(expected_gantt)
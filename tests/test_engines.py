@@ -0,0 +1,126 @@
+"""Randomized differential checks of the fast engines against the references."""
+import random
+from fractions import Fraction
+
+import pytest
+
+import FIFO
+import HRRN
+import SJF
+import SRT
+from process_table import ProcessTable
+from profiling import Profiler
+
+RESULTS = ('start_time', 'completion_time', 'turnaround_time', 'waiting_time', 'response_time')
+
+# (module, reference engine, fast engine)
+ENGINES = {
+    'FIFO': (FIFO, FIFO.FIFO_scheduling, FIFO.FIFO_scheduling_vectorized),
+    'SJF': (SJF, SJF.SJF_scheduling, SJF.SJF_scheduling_heap),
+    'SRT': (SRT, SRT.SRT_scheduling, SRT.SRT_scheduling_event_driven),
+    'HRRN': (HRRN, HRRN.HRRN_scheduling, HRRN.HRRN_scheduling_bucketed),
+}
+
+
+def random_workload(rnd, max_n=9, max_arrival=15, max_burst=6):
+    return [(i + 1, rnd.randint(0, max_arrival), rnd.randint(1, max_burst))
+            for i in range(rnd.randint(1, max_n))]
+
+
+def results(processes):
+    # By pid: FIFO_scheduling sorts its list in place
+    return sorted((int(p.pid),) + tuple(int(getattr(p, name)) for name in RESULTS) for p in processes)
+
+
+@pytest.mark.parametrize('name', ENGINES)
+def test_fast_engine_matches_reference(name):
+    module, reference, fast = ENGINES[name]
+    for trial in range(1500):
+        spec = random_workload(random.Random(trial))
+        expected = [module.Process(*row) for row in spec]
+        actual = [module.Process(*row) for row in spec]
+        expected_gantt, expected_utilization = reference(expected)
+        gantt, utilization = fast(actual)
+        assert list(gantt) == list(expected_gantt), spec
+        assert utilization == pytest.approx(expected_utilization), spec
+        assert results(actual) == results(expected), spec
+
+
+@pytest.mark.parametrize('name', ENGINES)
+def test_fast_engine_on_table_matches_objects(name):
+    module, _, fast = ENGINES[name]
+    for trial in range(300):
+        spec = random_workload(random.Random(trial))
+        processes = [module.Process(*row) for row in spec]
+        table = ProcessTable(*zip(*spec))
+        gantt, utilization = fast(processes)
+        table_gantt, table_utilization = fast(table)
+        assert list(table_gantt) == list(gantt), spec
+        assert table_utilization == utilization, spec
+        assert results(table) == results(processes), spec
+
+
+@pytest.mark.parametrize('name', ENGINES)
+def test_empty_workload(name):
+    module, reference, fast = ENGINES[name]
+    for engine in (reference, fast):
+        for processes in ([], ProcessTable([], [], [])):
+            gantt, utilization = engine(processes)
+            assert list(gantt) == [] and utilization == 0.0
+
+
+def test_srt_switch_costs_match_reference():
+    for trial in range(1500):
+        rnd = random.Random(trial)
+        spec = random_workload(rnd, max_n=8, max_arrival=12)
+        switch_cost, dispatch_cost = rnd.randint(0, 3), rnd.randint(0, 2)
+        expected = [SRT.Process(*row) for row in spec]
+        actual = [SRT.Process(*row) for row in spec]
+        expected_profiler, profiler = Profiler(), Profiler()
+        expected_gantt, expected_utilization = SRT.SRT_scheduling(expected, expected_profiler,
+                                                                  switch_cost, dispatch_cost)
+        gantt, utilization = SRT.SRT_scheduling_event_driven(actual, profiler, switch_cost, dispatch_cost)
+        assert list(gantt) == list(expected_gantt), spec
+        assert utilization == expected_utilization, spec
+        assert results(actual) == results(expected), spec
+        for counter in ('dispatches', 'context_switches', 'preemptions', 'switch_overhead', 'idle_skips'):
+            assert profiler.counters[counter] == expected_profiler.counters[counter], (counter, spec)
+
+
+def test_hrrn_counters_match_reference():
+    for trial in range(500):
+        spec = random_workload(random.Random(trial), max_arrival=30)
+        expected_profiler, profiler = Profiler(), Profiler()
+        HRRN.HRRN_scheduling([HRRN.Process(*row) for row in spec], expected_profiler)
+        HRRN.HRRN_scheduling_bucketed([HRRN.Process(*row) for row in spec], profiler)
+        for counter in ('dispatches', 'context_switches', 'idle_skips'):
+            assert profiler.counters[counter] == expected_profiler.counters[counter], (counter, spec)
+
+
+def test_response_ratio_queue_matches_brute_force():
+    for trial in range(1500):
+        rnd = random.Random(trial)
+        queue = HRRN.ResponseRatioQueue()
+        waiting = []  # (arrival_time, burst_time, index)
+        time = 0
+        for index in range(rnd.randint(1, 60)):
+            if waiting and rnd.random() < 0.45:
+                time += rnd.randint(0, 5)
+                # Exact ratios; equal ratios go to the lowest index
+                best = min(waiting, key=lambda job: (-Fraction(time - job[0], job[1]), job[2]))
+                assert queue.pop_highest(time) == (best[2], best[1]), trial
+                waiting.remove(best)
+            else:
+                arrival_time = max(time - rnd.randint(0, 3), 0) if rnd.random() < 0.3 else time
+                job = (arrival_time, rnd.randint(1, 8), index)
+                waiting.append(job)
+                queue.push(*job)
+        assert len(queue) == len(waiting)
+
+
+def test_table_copy_shares_no_columns():
+    table = ProcessTable([1, 2], [0, 3], [4, 5])
+    copy = table.copy()
+    for name in ('pid', 'arrival_time', 'burst_time', 'start_time', 'remaining_time'):
+        getattr(copy, name)[0] = 99
+        assert getattr(table, name)[0] != 99, name
@@ -0,0 +1,46 @@
+"""LogHistogram bucketing and MetricsAggregator against exact statistics."""
+import random
+
+import numpy as np
+import pytest
+
+from metrics import LogHistogram, MetricsAggregator
+from SRT import SRT_events, SRT_scheduling_event_driven
+from workloads import generate
+
+
+def test_record_many_matches_record():
+    rnd = random.Random(0)
+    values = [0, 1, 2, 127, 128, 129, 2**53 - 1, 2**53, 2**53 + 1, 2**60 - 1, 2**62, 2**63 - 1]
+    values += [rnd.getrandbits(rnd.randint(1, 63)) for _ in range(20000)]
+    one_by_one, at_once = LogHistogram(), LogHistogram()
+    for value in values:
+        one_by_one.record(np.int64(value))
+    at_once.record_many(values)
+    assert one_by_one.counts == at_once.counts
+    assert one_by_one.total == at_once.total == sum(values)
+    assert (one_by_one.min, one_by_one.max) == (at_once.min, at_once.max) == (min(values), max(values))
+
+
+def test_percentiles_within_bucket_precision():
+    rnd = random.Random(1)
+    values = sorted(rnd.randint(0, 10**9) for _ in range(10000))
+    histogram = LogHistogram()
+    histogram.record_many(values)
+    for q in (1, 50, 95, 99, 100):
+        exact = values[max(1, -(-len(values) * q // 100)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=1 / 64)
+
+
+def test_consume_matches_scheduled_table():
+    table = generate(2000, seed=3)
+    streamed = MetricsAggregator()
+    arrivals = zip(table.pid, table.arrival_time, table.burst_time)  # numpy integers
+    streamed.consume(SRT_events(streamed.observe(arrivals)))
+
+    scheduled = table.copy()
+    gantt_chart, _ = SRT_scheduling_event_driven(scheduled)
+    batch = MetricsAggregator()
+    batch.record_table(scheduled, gantt_chart)
+    assert streamed.report() == pytest.approx(batch.report())
+    assert streamed.report()['avg_waiting'] == pytest.approx(scheduled.waiting_time.mean())
@@ -0,0 +1,105 @@
+"""MLFQ_scheduling against a one-tick-at-a-time reference."""
+import random
+
+from FIFO import FIFO_scheduling_vectorized
+from MLFQ import MLFQ_scheduling, Process
+
+
+def tick_reference(spec, quanta, boost_interval, aging_threshold):
+    # Returns (start_times, completion_times) for spec, a list of (arrival, burst)
+    n = len(spec)
+    order = sorted(range(n), key=lambda i: spec[i][0])
+    levels = [[] for _ in quanta]  # Entries [index, aging deadline, sequence]
+    remaining = [burst for _, burst in spec]
+    level = [0] * n
+    used = [0] * n
+    start = [-1] * n
+    completion = [None] * n
+    sequence = 0
+    current = None
+    time = 0
+    arrived = 0
+    done = 0
+
+    def enqueue(i, to, front=False):
+        nonlocal sequence
+        level[i] = to
+        deadline = time + aging_threshold if aging_threshold is not None and to > 0 else None
+        entry = [i, deadline, sequence]
+        sequence += 1
+        if front:
+            levels[to].insert(0, entry)
+        else:
+            levels[to].append(entry)
+
+    while done < n:
+        while arrived < n and spec[order[arrived]][0] <= time:
+            enqueue(order[arrived], 0)
+            arrived += 1
+        if boost_interval and time > 0 and time % boost_interval == 0:
+            for lower in range(1, len(quanta)):
+                for entry in levels[lower]:
+                    used[entry[0]] = 0
+                    enqueue(entry[0], 0)
+                levels[lower] = []
+            if current is not None:
+                level[current] = 0
+                used[current] = 0
+        while True:
+            due = [(entry[1], entry[2], lower, entry) for lower in range(1, len(quanta))
+                   for entry in levels[lower] if entry[1] is not None and entry[1] <= time]
+            if not due:
+                break
+            _, _, lower, entry = min(due)
+            levels[lower].remove(entry)
+            used[entry[0]] = 0
+            enqueue(entry[0], lower - 1)
+        top = next((lower for lower in range(len(quanta)) if levels[lower]), None)
+        if current is not None and top is not None and top < level[current]:
+            enqueue(current, level[current], front=True)
+            current = None
+        if current is None:
+            if top is None:
+                time += 1
+                continue
+            current = levels[top].pop(0)[0]
+            if start[current] < 0:
+                start[current] = time
+        remaining[current] -= 1
+        used[current] += 1
+        time += 1
+        if remaining[current] == 0:
+            completion[current] = time
+            done += 1
+            current = None
+        elif used[current] == quanta[level[current]]:
+            used[current] = 0
+            finished_quantum, current = current, None
+            enqueue(finished_quantum, min(level[finished_quantum] + 1, len(quanta) - 1))
+    return start, completion
+
+
+def test_mlfq_matches_tick_reference():
+    for trial in range(1500):
+        rnd = random.Random(trial)
+        spec = [(rnd.randint(0, 30), rnd.randint(1, 15)) for _ in range(rnd.randint(1, 12))]
+        quanta = tuple(rnd.randint(1, 5) for _ in range(rnd.randint(1, 4)))
+        boost_interval = rnd.choice([None, rnd.randint(3, 20)])
+        aging_threshold = rnd.choice([None, rnd.randint(1, 15)])
+        processes = [Process(i, arrival, burst) for i, (arrival, burst) in enumerate(spec)]
+        MLFQ_scheduling(processes, quanta, boost_interval, aging_threshold)
+        start, completion = tick_reference(spec, quanta, boost_interval, aging_threshold)
+        assert [p.start_time for p in processes] == start, (spec, quanta, boost_interval, aging_threshold)
+        assert [p.completion_time for p in processes] == completion, (spec, quanta, boost_interval,
+                                                                     aging_threshold)
+
+
+def test_single_unbounded_level_is_fifo():
+    for trial in range(200):
+        rnd = random.Random(trial)
+        spec = [(i, rnd.randint(0, 50), rnd.randint(0, 9)) for i in range(30)]
+        mlfq = [Process(*row) for row in spec]
+        fifo = [Process(*row) for row in spec]
+        MLFQ_scheduling(mlfq, (10**9,))
+        FIFO_scheduling_vectorized(fifo)
+        assert [p.completion_time for p in mlfq] == [p.completion_time for p in fifo], spec
@@ -0,0 +1,65 @@
+"""multicore_scheduling on one CPU against the single-CPU engines, and its invariants."""
+import random
+
+import pytest
+
+import FIFO
+import HRRN
+import SJF
+import SRT
+from multicore import multicore_scheduling
+
+RESULTS = ('pid', 'start_time', 'completion_time', 'turnaround_time', 'waiting_time', 'response_time')
+
+ENGINES = {
+    'FIFO': (FIFO, FIFO.FIFO_scheduling_vectorized),
+    'SJF': (SJF, SJF.SJF_scheduling_heap),
+    'SRT': (SRT, SRT.SRT_scheduling_event_driven),
+    'HRRN': (HRRN, HRRN.HRRN_scheduling_bucketed),
+}
+
+
+def results(processes):
+    return [tuple(getattr(p, name) for name in RESULTS) for p in processes]
+
+
+@pytest.mark.parametrize('policy', ENGINES)
+def test_one_cpu_matches_single_cpu_engine(policy):
+    module, engine = ENGINES[policy]
+    for trial in range(500):
+        rnd = random.Random(trial)
+        spec = [(i + 1, rnd.randint(0, 20), rnd.randint(1, 7)) for i in range(rnd.randint(1, 12))]
+        expected = [module.Process(*row) for row in spec]
+        gantt, utilization = engine(expected)
+        for balancing in ('global', 'steal'):
+            actual = [module.Process(*row) for row in spec]
+            (cpu_gantt,), cpu_utilization, _ = multicore_scheduling(actual, policy, 1, balancing)
+            assert list(cpu_gantt) == list(gantt), (spec, balancing)
+            assert cpu_utilization == pytest.approx(utilization), (spec, balancing)
+            assert results(actual) == results(expected), (spec, balancing)
+
+
+@pytest.mark.parametrize('policy', ENGINES)
+@pytest.mark.parametrize('balancing', ('global', 'steal'))
+def test_several_cpus_run_every_burst_once(policy, balancing):
+    module, _ = ENGINES[policy]
+    for trial in range(300):
+        rnd = random.Random(trial)
+        spec = [(i + 1, rnd.randint(0, 20), rnd.randint(1, 7)) for i in range(rnd.randint(1, 12))]
+        processes = [module.Process(*row) for row in spec]
+        timelines, _, stats = multicore_scheduling(processes, policy, rnd.randint(2, 4), balancing)
+        runs = {}
+        for timeline in timelines:
+            last_end = 0
+            for pid, start, end in timeline:
+                assert start >= last_end, spec  # One job at a time per CPU
+                last_end = end
+                runs.setdefault(pid, []).append((start, end))
+        for p in processes:
+            own = sorted(runs[p.pid])
+            assert sum(end - start for start, end in own) == p.burst_time, spec
+            assert all(own[k][1] <= own[k + 1][0] for k in range(len(own) - 1)), spec
+            assert own[0][0] == p.start_time >= p.arrival_time, spec
+            assert own[-1][1] == p.completion_time, spec
+        if policy != 'SRT':
+            assert stats['preemptions'] == 0
@@ -0,0 +1,78 @@
+"""OnlineScheduler against the batch engines, submitted up front and while running."""
+import random
+
+import pytest
+
+import FIFO
+import HRRN
+import SJF
+import SRT
+from events import IDLE
+from online import OnlineScheduler
+
+# (module, batch engine, event generator)
+ENGINES = {
+    'FIFO': (FIFO, FIFO.FIFO_scheduling_vectorized, FIFO.FIFO_events),
+    'SJF': (SJF, SJF.SJF_scheduling_heap, SJF.SJF_events),
+    'SRT': (SRT, SRT.SRT_scheduling_event_driven, SRT.SRT_events),
+    'HRRN': (HRRN, HRRN.HRRN_scheduling_bucketed, HRRN.HRRN_events),
+}
+
+
+def random_workload(rnd):
+    # Sorted by arrival with pids in that order, so that submission order
+    # breaks ties the way the batch engines do
+    arrivals = sorted(rnd.randint(0, 20) for _ in range(rnd.randint(1, 10)))
+    return [(i, arrival, rnd.randint(1, 6)) for i, arrival in enumerate(arrivals)]
+
+
+@pytest.mark.parametrize('policy', ENGINES)
+def test_all_submitted_up_front_matches_batch_engine(policy):
+    module, engine, _ = ENGINES[policy]
+    for trial in range(500):
+        spec = random_workload(random.Random(trial))
+        processes = [module.Process(*row) for row in spec]
+        gantt, utilization = engine(processes)
+        scheduler = OnlineScheduler(policy)
+        for row in spec:
+            scheduler.submit(module.Process(*row))
+        events = scheduler.advance()
+        runs = [(pid, start, end) for pid, start, end, reason in events if reason != IDLE]
+        assert runs == list(gantt), spec
+        snapshot = scheduler.snapshot()
+        n = len(processes)
+        assert snapshot['completed'] == snapshot['submitted'] == n
+        assert snapshot['time'] == max(p.completion_time for p in processes)
+        assert snapshot['cpu_utilization'] == pytest.approx(utilization), spec
+        for name in ('waiting', 'turnaround', 'response'):
+            expected = sum(getattr(p, f"{name}_time") for p in processes) / n
+            assert snapshot[f"avg_{name}"] == pytest.approx(expected), (name, spec)
+
+
+@pytest.mark.parametrize('policy', ENGINES)
+def test_interleaved_submit_and_advance_matches_events(policy):
+    module, _, events_fn = ENGINES[policy]
+    for trial in range(500):
+        rnd = random.Random(trial)
+        spec = random_workload(rnd)
+        expected = [event for event in events_fn(spec) if event.reason != IDLE]
+        scheduler = OnlineScheduler(policy)
+        queue = list(spec)
+        events = []
+        while queue:
+            # Submit what arrives within the next step, then run to its end
+            horizon = scheduler.time + rnd.randint(0, 5)
+            while queue and queue[0][1] <= horizon:
+                scheduler.submit(module.Process(*queue.pop(0)))
+            events += scheduler.advance(horizon)
+            assert scheduler.time == horizon
+        events += scheduler.advance()
+        assert [event for event in events if event.reason != IDLE] == expected, spec
+        assert scheduler.snapshot()['completed'] == len(spec)
+
+
+def test_submit_in_the_past_is_rejected():
+    scheduler = OnlineScheduler('fifo')
+    scheduler.advance(5)
+    with pytest.raises(ValueError):
+        scheduler.submit(FIFO.Process(1, 4, 2))
@@ -0,0 +1,226 @@
+"""The PCB Round Robin against the original simulation, a tick reference and on several CPUs."""
+import contextlib
+import io
+import random
+
+import pytest
+
+import PCB
+
+
+class LegacyProcess:
+    # The original Process, one list entry per instruction
+    def __init__(self, pid, arrival_time, execution_time, resource_info, quantum_size):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.execution_time = list(range(execution_time))
+        self.resource_info = resource_info
+        self.quantum_size = quantum_size
+        self.finish_time = None
+        self.psw_resume_info_num = None
+        self.psw_resume_info_address = None
+        self.state = 'Ready'
+        self.pc = 0
+        self.ir = 0
+        self.processed_instructions = 0
+
+
+def legacy_print_pcb(process):
+    print(f"\nProcess ID = {process.pid}")
+    print(f"Arrival Time = {process.arrival_time}")
+    print(f"Execution Time = {len(process.execution_time)}")
+    print(f"Resource Information = {process.resource_info}")
+    print(
+        f"Finish Time = {process.finish_time if process.finish_time is not None else 'In Progress'}")
+    print(f"PSW Resume Info Number = {process.psw_resume_info_num}")
+    print(f"PSW Resume Info Address = {process.psw_resume_info_address}")
+    print(
+        f"Scheduling Algorithm = Round Robin (Quantum size = {process.quantum_size})")
+    print(f"State = {process.state}")
+    print(f"PC = {process.pc + 1}")
+    print(f"IR = {process.ir + 2}")
+    print(f"No of Processed Instructions = {process.processed_instructions}")
+    print("----------------------------------------")
+
+
+def legacy_round_robin_scheduler(processes):
+    # The original simulation, kept verbatim as the reference for the output
+    time = 0
+    blocked_queue = []
+
+    while processes or blocked_queue:
+        active_processes = processes.copy()
+
+        for process in active_processes:
+            if process.state == 'Blocked':
+                continue
+
+            if process.resource_info:
+                process.psw_resume_info_num = process.pc
+                process.psw_resume_info_address = f"{process.pid}[{process.pc}]"
+                process.state = 'Blocked'
+                blocked_queue.append(process)
+                processes.remove(process)
+                print(f"\n{process.pid} is blocked due to resource issue.")
+                continue
+
+            print(f"\nRunning {process.pid}")
+            process.state = 'Running'
+            quantum_size = process.quantum_size
+
+            for _ in range(quantum_size):
+                if process.pc < len(process.execution_time):
+                    process.ir = process.execution_time[process.pc]
+                    process.processed_instructions += 1
+                    legacy_print_pcb(process)
+
+                    process.pc += 1
+                    time += 1
+                else:
+                    process.finish_time = time
+                    process.state = 'Terminated'
+                    processes.remove(process)
+                    print(
+                        f"{process.pid} has terminated. Finish Time = {process.finish_time}.")
+                    break
+
+            if process.state != 'Terminated':
+                process.psw_resume_info_num = process.pc
+                process.psw_resume_info_address = f"{process.pid}[{process.pc}]"
+
+            if process.state != 'Terminated' and process not in blocked_queue:
+                process.state = 'Ready'
+
+        if not processes and blocked_queue:
+            print("\nHandling blocked processes...")
+            unblocked_processes = []
+            for process in blocked_queue:
+                process.resource_info = False
+                process.state = 'Ready'
+                unblocked_processes.append(process)
+                print(f"{process.pid} is unblocked and ready to resume.")
+
+            processes.extend(unblocked_processes)
+            blocked_queue.clear()
+
+        if not processes and not blocked_queue:
+            print("\nAll processes have been terminated or handled.")
+            break
+
+
+def state(process):
+    return (process.pid, process.finish_time, process.psw_resume_info_num,
+            process.psw_resume_info_address, process.state, process.pc, process.ir,
+            process.processed_instructions)
+
+
+def random_spec(rnd, max_n=6):
+    # (pid, arrival_time, execution_time, resource_info, quantum_size)
+    return [(f"P{i}", i, rnd.randint(0, 12), rnd.randint(0, 1), rnd.randint(1, 3))
+            for i in range(rnd.randint(1, max_n))]
+
+
+def test_trace_output_is_byte_identical_to_legacy():
+    for trial in range(500):
+        spec = random_spec(random.Random(trial))
+        legacy = [LegacyProcess(*row) for row in spec]
+        traced = [PCB.Process(*row) for row in spec]
+        untraced = [PCB.Process(*row) for row in spec]
+        expected, output = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(expected):
+            legacy_round_robin_scheduler(list(legacy))
+        with contextlib.redirect_stdout(output):
+            with PCB.console_tracer() as tracer:
+                PCB.round_robin_scheduler(list(traced), tracer)
+        PCB.round_robin_scheduler(list(untraced))
+        assert output.getvalue() == expected.getvalue(), spec
+        assert list(map(state, traced)) == list(map(state, legacy)), spec
+        assert list(map(state, untraced)) == list(map(state, legacy)), spec
+
+
+def arrival_reference(spec):
+    # Finish time per pid when each process is ready from its arrival; new
+    # arrivals queue ahead of the process whose quantum just ran out
+    by_arrival = sorted(range(len(spec)), key=lambda i: spec[i][1])
+    remaining = [row[2] for row in spec]
+    finish = {}
+    time = 0
+    queue = []
+
+    def admit():
+        while by_arrival and spec[by_arrival[0]][1] <= time:
+            queue.append(by_arrival.pop(0))
+
+    admit()
+    while queue or by_arrival:
+        if not queue:
+            time = spec[by_arrival[0]][1]
+            admit()
+            continue
+        i = queue.pop(0)
+        quantum_size = spec[i][3]
+        run = min(quantum_size, remaining[i])
+        time += run
+        remaining[i] -= run
+        admit()
+        if run < quantum_size:
+            finish[spec[i][0]] = time
+        else:
+            queue.append(i)
+    return finish
+
+
+def test_arrival_times_match_tick_reference():
+    for trial in range(1000):
+        rnd = random.Random(trial)
+        # (pid, arrival_time, execution_time, quantum_size)
+        spec = [(f"P{i}", rnd.randint(0, 30), rnd.randint(0, 12), rnd.randint(1, 4))
+                for i in range(rnd.randint(1, 7))]
+        processes = [PCB.Process(pid, arrival, execution, 0, quantum)
+                     for pid, arrival, execution, quantum in spec]
+        PCB.round_robin_scheduler(processes, use_arrival_times=True)
+        assert {p.pid: p.finish_time for p in processes} == arrival_reference(spec), spec
+
+
+@pytest.mark.parametrize('use_arrival_times', (False, True))
+@pytest.mark.parametrize('balancing', ('global', 'steal'))
+def test_multicore_on_one_cpu_matches_round_robin(balancing, use_arrival_times):
+    for trial in range(500):
+        rnd = random.Random(trial)
+        spec = random_spec(rnd, max_n=8)
+        if use_arrival_times:
+            spec = [(pid, rnd.randint(0, 30), execution, 0, quantum)
+                    for pid, _, execution, _, quantum in spec]
+        single = [PCB.Process(*row) for row in spec]
+        position = {p.pid: i for i, p in enumerate(single)}
+        expected = PCB.Timeline()
+        for pid, start, end, _ in PCB.round_robin_events(single, use_arrival_times=use_arrival_times):
+            if pid != PCB.IDLE_PID:
+                expected.append(position[pid], start, end)
+
+        counted = [PCB.Process(*row) for row in spec]
+        dispatches = PCB.round_robin_scheduler(counted, use_arrival_times=use_arrival_times)['dispatches']
+
+        processes = [PCB.Process(*row) for row in spec]
+        (timeline,), _, stats = PCB.multicore_round_robin_scheduler(
+            processes, 1, balancing, use_arrival_times=use_arrival_times)
+        assert list(timeline) == list(expected), spec
+        assert list(map(state, processes)) == list(map(state, single)), spec
+        assert stats['dispatches'] == dispatches, spec
+        assert stats['migrations'] == 0, spec
+
+
+def test_multicore_finishes_every_process():
+    for trial in range(300):
+        rnd = random.Random(trial)
+        processes = [PCB.Process(*row) for row in random_spec(rnd, max_n=8)]
+        timelines, _, _ = PCB.multicore_round_robin_scheduler(processes, 3, rnd.choice(['global', 'steal']))
+        assert all(p.state == 'Terminated' and p.pc == p.instruction_count for p in processes)
+        executed = sum(end - start for timeline in timelines for _, start, end in timeline)
+        assert executed == sum(p.instruction_count for p in processes)
+
+
+def test_multicore_exit_turns_are_not_dispatches():
+    processes = [PCB.Process('P0', 0, 6, 0, 3), PCB.Process('P1', 0, 3, 0, 3)]
+    _, _, stats = PCB.multicore_round_robin_scheduler(processes, 1)
+    assert stats['dispatches'] == 3
@@ -0,0 +1,142 @@
+"""Round Robin with I/O against hand-computed cases and a tick-level reference."""
+import random
+from collections import deque
+
+import PCB
+from resources import IORequest, ResourceManager
+
+
+def run(spec, capacities):
+    # spec: (pid, execution_time, quantum_size, io_requests) per process
+    processes = [PCB.Process(pid, 0, execution_time, 0, quantum_size, io_requests)
+                 for pid, execution_time, quantum_size, io_requests in spec]
+    stats = PCB.round_robin_io_scheduler(processes, ResourceManager(capacities))
+    return processes, stats
+
+
+def test_capacity_two_queues_the_third_request():
+    disk = IORequest(at=1, resource='disk', duration=5)
+    processes, stats = run([('P0', 4, 2, [disk]), ('P1', 4, 2, [disk]), ('P2', 4, 2, [disk])],
+                           {'disk': 2})
+    # P0 and P1 get the disk at 1 and 2; P2 queues at 3 until P0 is done at 6
+    assert [p.finish_time for p in processes] == [11, 12, 15]
+    assert [p.blocked_time for p in processes] == [5, 5, 8]
+    assert stats == {'disk': {'capacity': 2, 'grants': 3, 'wait_time': 3, 'busy_time': 15,
+                              'max_waiters': 1, 'utilization': 50.0}}
+
+
+def test_two_requests_at_the_same_pc_run_back_to_back():
+    requests = [IORequest(1, 'net', 3), IORequest(1, 'disk', 2)]
+    processes, stats = run([('P0', 3, 3, requests), ('P1', 2, 3, [])], {'disk': 1, 'net': 1})
+    # disk (sorted first) from 1 to 3 while P1 runs, then net from 3 to 6 with the CPU idle
+    assert [p.finish_time for p in processes] == [8, 3]
+    assert [p.blocked_time for p in processes] == [5, 0]
+    assert stats['disk']['grants'] == stats['net']['grants'] == 1
+    assert (stats['disk']['busy_time'], stats['net']['busy_time']) == (2, 3)
+    assert stats['disk']['wait_time'] == stats['net']['wait_time'] == 0
+
+
+def test_requests_at_or_past_the_last_instruction():
+    processes, stats = run([('P0', 2, 2, [IORequest(2, 'disk', 4)]),
+                            ('P1', 2, 2, [IORequest(5, 'disk', 1)])], {'disk': 1})
+    # P0 does its I/O after its last instruction; P1 never reaches pc 5
+    assert [p.finish_time for p in processes] == [6, 4]
+    assert [p.blocked_time for p in processes] == [4, 0]
+    assert stats['disk']['grants'] == 1 and stats['disk']['busy_time'] == 4
+
+
+def tick_reference(spec, capacities):
+    # Returns (finish_times, blocked_times, stats), advancing one time unit
+    # at a time and settling finished I/O at every tick
+    n = len(spec)
+    pc = [0] * n
+    next_request = [0] * n
+    requests = [sorted(row[3]) for row in spec]
+    finish = [None] * n
+    blocked_time = [0] * n
+    blocked_since = [None] * n
+    in_use = {name: 0 for name in capacities}
+    waiters = {name: deque() for name in capacities}
+    stats = {name: {'capacity': capacity, 'grants': 0, 'wait_time': 0, 'busy_time': 0,
+                    'max_waiters': 0} for name, capacity in capacities.items()}
+    doing_io = []  # [done_time, started, i, request]
+    started = 0
+    ready = deque(range(n))
+    time = 0
+
+    def start_io(i, request, now):
+        nonlocal started
+        stats[request.resource]['grants'] += 1
+        doing_io.append([now + request.duration, started, i, request])
+        started += 1
+
+    def settle(now):
+        while True:
+            due = [io for io in doing_io if io[0] <= now]
+            if not due:
+                return
+            io = min(due)
+            doing_io.remove(io)
+            done_time, _, i, request = io
+            stats[request.resource]['busy_time'] += request.duration
+            if waiters[request.resource]:
+                waiter, waiter_request, queued_at = waiters[request.resource].popleft()
+                stats[request.resource]['wait_time'] += done_time - queued_at
+                start_io(waiter, waiter_request, done_time)
+            else:
+                in_use[request.resource] -= 1
+            blocked_time[i] += done_time - blocked_since[i]
+            ready.append(i)
+
+    while ready or doing_io:
+        if not ready:
+            time += 1
+            settle(time)
+            continue
+        i = ready.popleft()
+        _, execution_time, quantum_size, _ = spec[i]
+        request = requests[i][next_request[i]] if next_request[i] < len(requests[i]) else None
+        used = 0
+        while used < quantum_size and pc[i] < execution_time and (request is None or pc[i] < request.at):
+            pc[i] += 1
+            used += 1
+            time += 1
+            if used < quantum_size:
+                settle(time)  # Those woken now queue ahead of i anyway
+        settle(time)
+        if request is not None and request.at <= pc[i]:
+            next_request[i] += 1
+            blocked_since[i] = time
+            if in_use[request.resource] < capacities[request.resource]:
+                in_use[request.resource] += 1
+                start_io(i, request, time)
+            else:
+                waiters[request.resource].append((i, request, time))
+                stats[request.resource]['max_waiters'] = max(stats[request.resource]['max_waiters'],
+                                                             len(waiters[request.resource]))
+            settle(time)
+        elif pc[i] == execution_time:
+            finish[i] = time
+        else:
+            ready.append(i)
+    for name, resource in stats.items():
+        if time:
+            resource['utilization'] = resource['busy_time'] / (resource['capacity'] * time) * 100
+    return finish, blocked_time, stats
+
+
+def test_matches_tick_reference():
+    for trial in range(1500):
+        rnd = random.Random(trial)
+        capacities = {'disk': rnd.randint(1, 2), 'net': rnd.randint(1, 3)}
+        spec = []
+        for i in range(rnd.randint(1, 8)):
+            execution_time = rnd.randint(0, 15)
+            requests = [IORequest(rnd.randint(0, execution_time + 1), rnd.choice(list(capacities)),
+                                  rnd.randint(0, 6)) for _ in range(rnd.randint(0, 3))]
+            spec.append((f"P{i}", execution_time, rnd.randint(1, 4), requests))
+        processes, stats = run(spec, capacities)
+        finish, blocked_time, expected_stats = tick_reference(spec, capacities)
+        assert [p.finish_time for p in processes] == finish, spec
+        assert [p.blocked_time for p in processes] == blocked_time, spec
+        assert stats == expected_stats, spec
@@ -0,0 +1,41 @@
+"""Trace files: round trips, mapped columns and lazily allocated results."""
+import numpy as np
+
+from process_table import RESULT_COLUMNS
+from schedulers import run_algorithm
+from sweep import sweep
+from tracefile import open_trace, write_results, write_trace
+from workloads import generate
+
+
+def test_open_trace_maps_inputs_and_allocates_no_results(tmp_path):
+    table = generate(500, seed=3)
+    path = str(tmp_path / 'workload.trace')
+    write_trace(path, table)
+    mapped = open_trace(path)
+    for name in ('pid', 'arrival_time', 'burst_time'):
+        assert np.array_equal(getattr(mapped, name), getattr(table, name))
+        assert isinstance(getattr(mapped, name).base, np.memmap), name
+    assert not any(name in vars(mapped) for name in RESULT_COLUMNS)
+    assert list(mapped.start_time[:3]) == [-1] * 3
+    assert np.array_equal(mapped.remaining_time, table.burst_time)
+
+
+def test_results_round_trip(tmp_path):
+    table = generate(500, seed=4)
+    path = str(tmp_path / 'workload.trace')
+    write_trace(path, table)
+    expected = run_algorithm('SRT', table)[0]
+    write_results(path, expected)
+    mapped = open_trace(path, 'r+')
+    for name in RESULT_COLUMNS:
+        assert np.array_equal(getattr(mapped, name), getattr(expected, name)), name
+
+
+def test_sweep_over_a_trace_matches_the_table(tmp_path):
+    table = generate(300, seed=5)
+    path = str(tmp_path / 'workload.trace')
+    write_trace(path, table)
+    grid = {'algorithm': ['SJF', 'RR'], 'quantum': [2, 4]}
+    assert sweep(path, grid, max_workers=1) == sweep(table, grid, max_workers=1)
+    assert sweep(path, grid, max_workers=2) == sweep(table, grid, max_workers=1)